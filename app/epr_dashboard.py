@@ -1,17 +1,198 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 import sys
 import os
+from types import MappingProxyType
 
 # Add the project root to the path so imports work correctly
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.localization import get_text
 
+# Fixed seed so the mock trend data is stable across reruns and cacheable
+TREND_SEED = 0
+
+# EPR targets based on sector
+_EPR_TARGETS = MappingProxyType({
+    "Plastic Packaging": 50,  # % recovery target
+    "Electronics": 60,
+    "Batteries": 40,
+    "Tyres": 80,
+    "Paper": 70,
+    "Textiles": 30
+})
+
+# EPR obligations per industry sector
+_OBLIGATIONS = MappingProxyType({
+    "Plastic Packaging": (
+        "Minimum 50% collection rate by 2024",
+        "Maintain records of plastic waste",
+        "Submit annual returns to SPCB",
+        "Implement plastic waste management plan"
+    ),
+    "Electronics": (
+        "Minimum 60% collection rate by 2023",
+        "Establish collection centers",
+        "Ensure environmentally sound dismantling",
+        "Provide consumer awareness programs"
+    ),
+    "Batteries": (
+        "Minimum 40% collection rate by 2023",
+        "Register with Central Pollution Control Board",
+        "Maintain producer responsibility organization",
+        "Submit half-yearly returns"
+    ),
+    "Tyres": (
+        "Minimum 80% collection rate by 2025",
+        "Ensure authorized channel utilization",
+        "Maintain dealer registration records",
+        "Implement take-back system"
+    ),
+    "Paper": (
+        "Minimum 70% collection rate by 2024",
+        "Promote recycled paper usage",
+        "Maintain waste management records",
+        "Support waste paper collection"
+    ),
+    "Textiles": (
+        "Minimum 30% collection rate by 2025",
+        "Develop sustainable textile practices",
+        "Promote circular economy models",
+        "Implement textile waste management"
+    )
+})
+
+# Mock compliance report data
+_REPORT_DATA = MappingProxyType({
+    "Report Type": (
+        "Quarterly EPR Report Q1",
+        "Annual EPR Report FY 2023-24", 
+        "Self Declaration Form",
+        "EPR Certificate Application",
+        "Annual Return to CPCB"
+    ),
+    "Due Date": (
+        "2024-05-31",
+        "2024-04-30",
+        "2024-03-31", 
+        "2024-02-29",
+        "2024-07-31"
+    ),
+    "Status": (
+        "✅ Submitted",
+        "✅ Submitted",
+        "✅ Submitted",
+        "✅ Approved",
+        "📅 Pending"
+    ),
+    "Action": (
+        "Download",
+        "Download", 
+        "Download",
+        "Download",
+        "Submit"
+    )
+})
+
+# CPCB EPR guidelines summary
+_EPR_GUIDELINES = MappingProxyType({
+    "Legal Framework": (
+        "E-Waste (Management) Rules, 2016",
+        "Plastic Waste Management Rules, 2016",
+        "Battery Waste Management Rules, 2022",
+        "Tyre Waste Management Rules, 2018"
+    ),
+    "Key Requirements": (
+        "Producer registration with CPCB/SPCB",
+        "Setting up collection channels",
+        "Ensuring environmentally sound management",
+        "Maintaining detailed records",
+        "Submitting periodic returns"
+    ),
+    "Penalties": (
+        "Fine up to ₹50,000 for non-compliance",
+        "Additional ₹5,000 per day for continuing violation",
+        "Criminal liability under Environment Protection Act",
+        "Cancellation of manufacturing license"
+    )
+})
+
+@st.cache_data(ttl=3600)
+def _epr_trend_df(start_date, end_date, seed: int = TREND_SEED) -> pd.DataFrame:
+    """
+    Build the mock monthly trend data for the Trends tab.
+    Cached so sidebar interactions don't regenerate it on every rerun.
+    """
+    dates = pd.date_range(start=start_date, end=end_date, freq='MS')
+    rng = np.random.Generator(np.random.PCG64(seed))
+    waste_generated = rng.normal(100, 20, len(dates))  # tons per month
+    # 60-80% collection; multiply into the uniform draw instead of a new temporary
+    waste_collected = rng.uniform(0.6, 0.8, len(dates))
+    np.multiply(waste_collected, waste_generated, out=waste_collected)
+    recovery_rate = np.divide(waste_collected, waste_generated)
+    recovery_rate *= 100
+    
+    return pd.DataFrame({
+        'Date': dates.values,
+        'Waste Generated (tons)': waste_generated,
+        'Waste Collected (tons)': waste_collected,
+        'Recovery Rate (%)': recovery_rate
+    }, copy=False)
+
+@st.cache_data
+def _epr_reports_df() -> pd.DataFrame:
+    """
+    Build the mock compliance reports table
+    """
+    return pd.DataFrame(dict(_REPORT_DATA))
+
+@st.cache_resource
+def _build_trend_figs(start_date, end_date, target_recovery_rate):
+    """
+    Build the Trends tab figures. The trend data is fully determined by the
+    date range, so the figures are keyed on the same scalars.
+    """
+    # Plotly is only needed once the charts are built; keep it off the import path
+    import plotly.express as px
+    
+    trend_df = _epr_trend_df(start_date, end_date)
+    
+    fig = px.line(trend_df, x='Date', y=['Waste Generated (tons)', 'Waste Collected (tons)'], 
+                 title='Monthly Waste Generation vs Collection Trend')
+    
+    fig2 = px.line(trend_df, x='Date', y='Recovery Rate (%)', 
+                  title='Monthly Recovery Rate Trend',
+                  range_y=[0, 100])
+    fig2.add_hline(y=target_recovery_rate, line_dash="dash", line_color="red", 
+                   annotation_text=f"Target: {target_recovery_rate}%")
+    return fig, fig2
+
+@st.cache_resource
+def _build_progress_fig(current_recovery, target_recovery_rate):
+    """
+    Build the recovery-rate gauge for the Targets tab
+    """
+    import plotly.graph_objects as go
+    
+    return go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=current_recovery,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': f"Recovery Rate vs Target ({target_recovery_rate}%)"},
+        delta={'reference': target_recovery_rate},
+        gauge={'axis': {'range': [None, 100]},
+               'bar': {'color': "darkblue"},
+               'steps': [
+                   {'range': [0, 50], 'color': "lightgray"},
+                   {'range': [50, 80], 'color': "yellow"},
+                   {'range': [80, 100], 'color': "green"}],
+               'threshold': {
+                   'line': {'color': "red", 'width': 4},
+                   'thickness': 0.75,
+                   'value': target_recovery_rate}}))
+
 def show_epr_dashboard():
     """
     Display the Extended Producer Responsibility (EPR) compliance dashboard
@@ -38,21 +219,11 @@ def show_epr_dashboard():
             [f"FY {year}-{year+1}" for year in range(2020, 2027)]
         )
         
-        # EPR targets based on sector
-        epr_targets = {
-            "Plastic Packaging": 50,  # % recovery target
-            "Electronics": 60,
-            "Batteries": 40,
-            "Tyres": 80,
-            "Paper": 70,
-            "Textiles": 30
-        }
-        
         target_recovery_rate = st.slider(
             "Target Recovery Rate (%)",
             min_value=10,
             max_value=100,
-            value=epr_targets[industry_sector],
+            value=_EPR_TARGETS[industry_sector],
             step=5
         )
         
@@ -98,66 +269,14 @@ def show_epr_dashboard():
             )
     
     with tab2:
-        # Generate trend data
-        dates = pd.date_range(start=start_date, end=end_date, freq='M')
-        waste_generated = np.random.normal(100, 20, len(dates))  # tons per month
-        waste_collected = waste_generated * np.random.uniform(0.6, 0.8, len(dates))  # 60-80% collection
-        recovery_rate = (waste_collected / waste_generated) * 100
-        
-        trend_df = pd.DataFrame({
-            'Date': dates,
-            'Waste Generated (tons)': waste_generated,
-            'Waste Collected (tons)': waste_collected,
-            'Recovery Rate (%)': recovery_rate
-        })
-        
-        fig = px.line(trend_df, x='Date', y=['Waste Generated (tons)', 'Waste Collected (tons)'], 
-                     title='Monthly Waste Generation vs Collection Trend')
+        fig, fig2 = _build_trend_figs(start_date, end_date, target_recovery_rate)
         st.plotly_chart(fig, use_container_width=True)
-        
-        fig2 = px.line(trend_df, x='Date', y='Recovery Rate (%)', 
-                      title='Monthly Recovery Rate Trend',
-                      range_y=[0, 100])
-        fig2.add_hline(y=target_recovery_rate, line_dash="dash", line_color="red", 
-                       annotation_text=f"Target: {target_recovery_rate}%")
         st.plotly_chart(fig2, use_container_width=True)
     
     with tab3:
         st.subheader("EPR Compliance Reports")
         
-        # Create mock report data
-        report_data = {
-            "Report Type": [
-                "Quarterly EPR Report Q1",
-                "Annual EPR Report FY 2023-24", 
-                "Self Declaration Form",
-                "EPR Certificate Application",
-                "Annual Return to CPCB"
-            ],
-            "Due Date": [
-                "2024-05-31",
-                "2024-04-30",
-                "2024-03-31", 
-                "2024-02-29",
-                "2024-07-31"
-            ],
-            "Status": [
-                "✅ Submitted",
-                "✅ Submitted",
-                "✅ Submitted",
-                "✅ Approved",
-                "📅 Pending"
-            ],
-            "Action": [
-                "Download",
-                "Download", 
-                "Download",
-                "Download",
-                "Submit"
-            ]
-        }
-        
-        reports_df = pd.DataFrame(report_data)
+        reports_df = _epr_reports_df()
         st.dataframe(reports_df, use_container_width=True)
         
         st.subheader("Documentation Checklist")
@@ -173,52 +292,11 @@ def show_epr_dashboard():
     with tab4:
         st.subheader("EPR Targets & Obligations")
         
-        # Show obligations based on sector
-        obligations = {
-            "Plastic Packaging": [
-                "Minimum 50% collection rate by 2024",
-                "Maintain records of plastic waste",
-                "Submit annual returns to SPCB",
-                "Implement plastic waste management plan"
-            ],
-            "Electronics": [
-                "Minimum 60% collection rate by 2023",
-                "Establish collection centers",
-                "Ensure environmentally sound dismantling",
-                "Provide consumer awareness programs"
-            ],
-            "Batteries": [
-                "Minimum 40% collection rate by 2023",
-                "Register with Central Pollution Control Board",
-                "Maintain producer responsibility organization",
-                "Submit half-yearly returns"
-            ],
-            "Tyres": [
-                "Minimum 80% collection rate by 2025",
-                "Ensure authorized channel utilization",
-                "Maintain dealer registration records",
-                "Implement take-back system"
-            ],
-            "Paper": [
-                "Minimum 70% collection rate by 2024",
-                "Promote recycled paper usage",
-                "Maintain waste management records",
-                "Support waste paper collection"
-            ],
-            "Textiles": [
-                "Minimum 30% collection rate by 2025",
-                "Develop sustainable textile practices",
-                "Promote circular economy models",
-                "Implement textile waste management"
-            ]
-        }
-        
         st.write(f"**Sector:** {industry_sector}")
         st.write(f"**Target Recovery Rate:** {target_recovery_rate}%")
         
         st.write("**Key Obligations:**")
-        for obligation in obligations[industry_sector]:
-            st.write(f"- {obligation}")
+        st.markdown("\n".join(f"- {obligation}" for obligation in _OBLIGATIONS[industry_sector]))
         
         # Progress toward target
         st.write("**Progress Tracking:**")
@@ -226,66 +304,26 @@ def show_epr_dashboard():
         # Simulated progress
         current_recovery = 63.4  # This would come from actual data
         
-        fig_progress = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=current_recovery,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': f"Recovery Rate vs Target ({target_recovery_rate}%)"},
-            delta={'reference': target_recovery_rate},
-            gauge={'axis': {'range': [None, 100]},
-                   'bar': {'color': "darkblue"},
-                   'steps': [
-                       {'range': [0, 50], 'color': "lightgray"},
-                       {'range': [50, 80], 'color': "yellow"},
-                       {'range': [80, 100], 'color': "green"}],
-                   'threshold': {
-                       'line': {'color': "red", 'width': 4},
-                       'thickness': 0.75,
-                       'value': target_recovery_rate}}))
+        fig_progress = _build_progress_fig(current_recovery, target_recovery_rate)
         
         st.plotly_chart(fig_progress, use_container_width=True)
     
     # Additional EPR information
     st.subheader("CPCB EPR Guidelines Summary")
     
-    epr_guidelines = {
-        "Legal Framework": [
-            "E-Waste (Management) Rules, 2016",
-            "Plastic Waste Management Rules, 2016",
-            "Battery Waste Management Rules, 2022",
-            "Tyre Waste Management Rules, 2018"
-        ],
-        "Key Requirements": [
-            "Producer registration with CPCB/SPCB",
-            "Setting up collection channels",
-            "Ensuring environmentally sound management",
-            "Maintaining detailed records",
-            "Submitting periodic returns"
-        ],
-        "Penalties": [
-            "Fine up to ₹50,000 for non-compliance",
-            "Additional ₹5,000 per day for continuing violation",
-            "Criminal liability under Environment Protection Act",
-            "Cancellation of manufacturing license"
-        ]
-    }
-    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.write("**Legal Framework**")
-        for item in epr_guidelines["Legal Framework"]:
-            st.write(f"- {item}")
+        st.markdown("\n".join(f"- {item}" for item in _EPR_GUIDELINES["Legal Framework"]))
     
     with col2:
         st.write("**Key Requirements**")
-        for item in epr_guidelines["Key Requirements"]:
-            st.write(f"- {item}")
+        st.markdown("\n".join(f"- {item}" for item in _EPR_GUIDELINES["Key Requirements"]))
     
     with col3:
         st.write("**Penalties**")
-        for item in epr_guidelines["Penalties"]:
-            st.write(f"- {item}")
+        st.markdown("\n".join(f"- {item}" for item in _EPR_GUIDELINES["Penalties"]))
     
     # Contact for EPR compliance
     st.subheader("Need Help with EPR Compliance?")
@@ -1,14 +1,11 @@
 ﻿import streamlit as st
-from PIL import Image
 import io
 import json
+import copy
+from functools import partial
 import pandas as pd
 import sys
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Add the project root to the path so imports work correctly
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,37 +19,29 @@ from utils.ui_helpers import (
     render_recycler_options,
     render_multilanguage_header,
     translate_text,
-    show_loading_animation
+    analyzing_spinner
 )
 
-try:
-    from streamlit_geolocation import streamlit_geolocation
-except Exception:
-    streamlit_geolocation = None
-
 # Initialize session state
-if "analysis_complete" not in st.session_state:
-    st.session_state.analysis_complete = False
-if "material_analysis" not in st.session_state:
-    st.session_state.material_analysis = {}
-if "safety_assessment" not in st.session_state:
-    st.session_state.safety_assessment = {}
-if "compliance_info" not in st.session_state:
-    st.session_state.compliance_info = {}
-if "nearby_options" not in st.session_state:
-    st.session_state.nearby_options = []
-if "system_output" not in st.session_state:
-    st.session_state.system_output = {}
-if "user_city" not in st.session_state:
-    st.session_state.user_city = ""
-if "user_lat" not in st.session_state:
-    st.session_state.user_lat = None
-if "user_lon" not in st.session_state:
-    st.session_state.user_lon = None
-if "gps_error" not in st.session_state:
-    st.session_state.gps_error = ""
-if "show_raw_json" not in st.session_state:
-    st.session_state.show_raw_json = False
+_SESSION_DEFAULTS = {
+    "analysis_complete": False,
+    "material_analysis": {},
+    "safety_assessment": {},
+    "compliance_info": {},
+    "nearby_options": [],
+    "system_output": {},
+    "user_city": "",
+    "user_lat": None,
+    "user_lon": None,
+    "gps_error": "",
+    "show_raw_json": False,
+}
+# Copy so sessions never share the mutable default containers
+st.session_state.update({
+    key: copy.copy(value)
+    for key, value in _SESSION_DEFAULTS.items()
+    if key not in st.session_state
+})
 
 
 def _validate_lat_lon(lat, lon):
@@ -64,6 +53,14 @@ def _validate_lat_lon(lat, lon):
     return -90.0 <= lat_f <= 90.0 and -180.0 <= lon_f <= 180.0
 
 
+@st.cache_data
+def _map_df(map_points: tuple) -> pd.DataFrame:
+    """
+    Build the st.map DataFrame once per distinct set of points
+    """
+    return pd.DataFrame(list(map_points), columns=["lat", "lon", "name", "distance_km"])
+
+
 def main():
     # Set page config
     st.set_page_config(
@@ -90,16 +87,24 @@ def main():
     # Render multilanguage header
     render_multilanguage_header()
 
+    # Language is fixed for the rest of this render
+    t = partial(translate_text, lang=st.session_state.get("lang", "en"))
+
     # Sidebar with instructions
     with st.sidebar:
-        st.header(translate_text("about", st.session_state.get("lang", "en")))
-        st.info(translate_text("about_desc", st.session_state.get("lang", "en")))
+        st.header(t("about"))
+        st.info(t("about_desc"))
 
-        st.header(translate_text("settings", st.session_state.get("lang", "en")))
-        _ = st.checkbox(translate_text("api_keys_config", st.session_state.get("lang", "en")), value=True)
+        st.header(t("settings"))
+        _ = st.checkbox(t("api_keys_config"), value=True)
         st.text_input("City (optional)", key="user_city")
         st.checkbox("Show raw JSON output", key="show_raw_json")
 
+        try:
+            from streamlit_geolocation import streamlit_geolocation
+        except Exception:
+            streamlit_geolocation = None
+
         if streamlit_geolocation is None:
             st.info("Location auto-detect requires streamlit-geolocation.")
         else:
@@ -114,8 +119,8 @@ def main():
             if st.session_state.gps_error:
                 st.warning(st.session_state.gps_error)
 
-        st.header(translate_text("features", st.session_state.get("lang", "en")))
-        st.write(translate_text("feature_list", st.session_state.get("lang", "en")))
+        st.header(t("features"))
+        st.write(t("feature_list"))
 
     # Create Tabs for different Personas
     tab1, tab2, tab3 = st.tabs(["Citizen Navigator", "Marketplace (B2B)", "EPR Dashboard"])
@@ -125,32 +130,32 @@ def main():
         st.markdown("### Upload Waste Image")
 
         uploaded_file = st.file_uploader(
-            translate_text("upload_waste", st.session_state.get("lang", "en")),
+            t("upload_waste"),
             type=["jpg", "jpeg", "png"],
             accept_multiple_files=False,
             key="citizen_uploader"
         )
 
         if uploaded_file is not None:
-            image = Image.open(uploaded_file)
+            from PIL import Image
+
+            img_bytes = uploaded_file.getvalue()
+            # Image.open only parses the header here; it's used for display metadata
+            image = Image.open(io.BytesIO(img_bytes))
             col1, col2 = st.columns([1, 2])
 
             with col1:
-                st.image(image, caption="Uploaded Artifact", use_column_width=True)
+                st.image(img_bytes, caption="Uploaded Artifact", use_column_width=True)
 
             with col2:
-                st.write(f"**{translate_text('image_details', st.session_state.get('lang', 'en'))}**")
+                st.write(f"**{t('image_details')}**")
                 st.write(f"Dimensions: {image.size[0]} x {image.size[1]} px")
                 st.write(f"Format: {image.format}")
 
-            if st.button(translate_text("analyze_button", st.session_state.get("lang", "en")), type="primary", key="analyze_btn"):
-                with st.spinner(translate_text("processing", st.session_state.get("lang", "en"))):
+            if st.button(t("analyze_button"), type="primary", key="analyze_btn"):
+                with analyzing_spinner(t("processing")):
                     system = CircularAISystem()
 
-                    img_byte_arr = io.BytesIO()
-                    image.save(img_byte_arr, format=image.format)
-                    img_bytes = img_byte_arr.getvalue()
-
                     user_lat = st.session_state.get("user_lat")
                     user_lon = st.session_state.get("user_lon")
                     if not _validate_lat_lon(user_lat, user_lon):
@@ -180,7 +185,7 @@ def main():
 
         if st.session_state.analysis_complete:
             st.markdown("---")
-            st.header(translate_text("results", st.session_state.get("lang", "en")))
+            st.header(t("results"))
 
             render_safety_indicator(
                 st.session_state.safety_assessment.get("is_hazardous", False),
@@ -204,35 +209,33 @@ def main():
             do_not = st.session_state.system_output.get("do_not", [])
             if instructions:
                 st.subheader("What To Do")
-                for step in instructions:
-                    st.write(f"- {step}")
+                st.markdown("\n".join(f"- {step}" for step in instructions))
             if do_not:
                 st.subheader("What Not To Do")
-                for item in do_not:
-                    st.write(f"- {item}")
+                st.markdown("\n".join(f"- {item}" for item in do_not))
 
-            st.subheader(translate_text("recycling_options", st.session_state.get("lang", "en")))
+            st.subheader(t("recycling_options"))
             render_recycler_options(st.session_state.get("nearby_options", []))
 
             map_points = []
             for r in st.session_state.get("nearby_options", []):
                 if r.get("latitude") is not None and r.get("longitude") is not None:
-                    map_points.append({
-                        "lat": r.get("latitude"),
-                        "lon": r.get("longitude"),
-                        "name": r.get("name"),
-                        "distance_km": r.get("distance")
-                    })
+                    map_points.append((
+                        r.get("latitude"),
+                        r.get("longitude"),
+                        r.get("name"),
+                        r.get("distance")
+                    ))
             if st.session_state.get("user_lat") is not None and st.session_state.get("user_lon") is not None:
-                map_points.append({
-                    "lat": st.session_state.get("user_lat"),
-                    "lon": st.session_state.get("user_lon"),
-                    "name": "You",
-                    "distance_km": 0
-                })
+                map_points.append((
+                    st.session_state.get("user_lat"),
+                    st.session_state.get("user_lon"),
+                    "You",
+                    0
+                ))
             if map_points:
                 st.subheader("Nearby Recyclers Map")
-                st.map(pd.DataFrame(map_points), latitude="lat", longitude="lon")
+                st.map(_map_df(tuple(map_points)), latitude="lat", longitude="lon")
 
             if st.session_state.get("show_raw_json"):
                 st.subheader("System Output (JSON)")
@@ -240,8 +243,8 @@ def main():
 
         else:
             st.markdown("---")
-            st.subheader(translate_text("welcome_title", st.session_state.get("lang", "en")))
-            st.info(translate_text("welcome_info", st.session_state.get("lang", "en")))
+            st.subheader(t("welcome_title"))
+            st.info(t("welcome_info"))
 
     # --- TAB 2: MARKETPLACE (B2B) ---
     with tab2:
@@ -1,66 +1,123 @@
 import os
-import PyPDF2
-import pdfplumber
 from dotenv import load_dotenv
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.vectorstores import Pinecone
-import pinecone
 import re
+import hashlib
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, lru_cache
+
+# PDF, LangChain and Pinecone libraries are imported inside the functions that use
+# them: they are slow to import and pool workers only need the extraction path
 
 load_dotenv()
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_LIGATURES = str.maketrans({'ﬁ': 'fi', 'ﬂ': 'fl'})
+
+# Embedding requests are network-bound: send several batches concurrently
+EMBED_BATCH_SIZE = 256
+EMBED_CONCURRENCY = 4
+UPSERT_BATCH_SIZE = 100
+
+PDF_TEXT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "pdf_text")
+
+def _extract_text_pdfium(pdf_path):
+    """
+    Extract plain text from PDF with PDFium (C++), much faster than pdfplumber's layout analysis
+    """
+    import pypdfium2 as pdfium
+    
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        parts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            parts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return "\n".join(parts)
+    finally:
+        pdf.close()
+
 def extract_text_from_pdf(pdf_path):
     """
-    Extract text from PDF using pdfplumber for better accuracy
+    Extract text from PDF using pypdfium2, falling back to pdfplumber and PyPDF2
     """
-    text = ""
     try:
+        return _extract_text_pdfium(pdf_path)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"Error extracting text with pypdfium2: {e}")
+    
+    parts = []
+    try:
+        import pdfplumber
         with pdfplumber.open(pdf_path) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:
-                    text += page_text
+                    parts.append(page_text)
     except Exception as e:
         print(f"Error extracting text with pdfplumber: {e}")
         # Fallback to PyPDF2
         try:
+            import PyPDF2
             with open(pdf_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
                 for page in reader.pages:
-                    text += page.extract_text()
+                    parts.append(page.extract_text())
         except Exception as e2:
             print(f"Error extracting text with PyPDF2: {e2}")
     
+    return "".join(parts)
+
+def extract_text_cached(pdf_path, cache_dir=PDF_TEXT_CACHE_DIR):
+    """
+    Extract text from PDF, reusing a previous extraction if the file is unchanged.
+    Cache entries are keyed on (path, mtime, size) so edited PDFs are re-parsed.
+    """
+    stat = os.stat(pdf_path)
+    key = f"{os.path.abspath(pdf_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".txt")
+    
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    
+    text = extract_text_from_pdf(pdf_path)
+    if text:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Could not write PDF text cache for {pdf_path}: {e}")
+    
     return text
 
 def clean_text(text):
     """
     Clean extracted text by removing extra whitespaces and fixing common OCR issues
     """
-    # Remove extra whitespaces and newlines
-    text = re.sub(r'\s+', ' ', text)
-    # Remove page numbers and headers/footers that might have been captured
-    text = re.sub(r'\d+\s*\n\s*', '', text)
-    # Remove multiple consecutive spaces
-    text = re.sub(r'[ \t]{2,}', ' ', text)
-    # Fix common OCR issues
-    text = text.replace('ﬁ', 'fi').replace('ﬂ', 'fl')
-    return text.strip()
+    # Fix common OCR ligatures, then collapse whitespace runs and newlines in one pass
+    return _WHITESPACE_RE.sub(' ', text.translate(_LIGATURES)).strip()
 
-def process_cpcb_documents(pdf_directory="./data/cpcb_pdfs/", chunk_size=1000, chunk_overlap=100):
+@lru_cache(maxsize=None)
+def _pinecone_index(index_name):
     """
-    Process CPCB documents: PDF extraction → text cleaning → chunking → embedding → Pinecone upsert
+    Initialize Pinecone and return a handle to the index, creating it if needed.
+    Cached so the init/list/create round-trips happen once per process.
     """
-    # Initialize Pinecone
+    import pinecone
+    
     pinecone.init(
         api_key=os.getenv("PINECONE_API_KEY"),
         environment=os.getenv("PINECONE_ENVIRONMENT")
     )
     
-    # Create or connect to index
-    index_name = os.getenv("PINECONE_INDEX_NAME", "cpcb-waste-rules")
-    
     # Check if index exists, if not create it
     if index_name not in pinecone.list_indexes():
         pinecone.create_index(
@@ -68,69 +125,164 @@ def process_cpcb_documents(pdf_directory="./data/cpcb_pdfs/", chunk_size=1000, c
             dimension=1536,  # OpenAI embedding dimension
             metric='cosine'
         )
+    return pinecone.Index(index_name)
+
+@lru_cache(maxsize=1)
+def _embeddings():
+    """
+    Shared OpenAI embeddings client
+    """
+    from langchain.embeddings.openai import OpenAIEmbeddings
     
-    # Initialize embeddings
-    embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    return OpenAIEmbeddings(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        chunk_size=EMBED_BATCH_SIZE,
+        max_retries=6
+    )
+
+@lru_cache(maxsize=None)
+def _text_splitter(chunk_size, chunk_overlap):
+    """
+    Reusable text splitter per (chunk_size, chunk_overlap); length defaults to len
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
     
-    # Initialize text splitter
-    text_splitter = RecursiveCharacterTextSplitter(
+    return RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
-        length_function=len,
     )
+
+def _process_pdf(pdf_path, chunk_size=1000, chunk_overlap=100):
+    """
+    Extract, clean and chunk a single PDF. Runs in a worker process.
+    """
+    print(f"Processing {os.path.basename(pdf_path)}...")
+    
+    # Extract text from PDF
+    raw_text = extract_text_cached(pdf_path)
+    if not raw_text:
+        return []
+    
+    # Clean the text
+    cleaned_text = clean_text(raw_text)
+    
+    # Split text into chunks
+    return _text_splitter(chunk_size, chunk_overlap).split_text(cleaned_text)
+
+async def _embed_in_batches(embeddings, texts, batch_size=EMBED_BATCH_SIZE, concurrency=EMBED_CONCURRENCY):
+    """
+    Embed texts in batches, keeping up to `concurrency` requests in flight
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def embed_batch(batch):
+        async with semaphore:
+            return await embeddings.aembed_documents(batch)
+    
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    return [vector for batch_vectors in results for vector in batch_vectors]
+
+def _upsert_vectors(index, texts, vectors, metadatas, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Bulk upsert embedded chunks into Pinecone. The chunk text is stored under the
+    "text" metadata key so the LangChain Pinecone vectorstore can read it back.
+    IDs are derived from source + chunk_id so re-ingesting a PDF overwrites its chunks.
+    """
+    records = [
+        (f"{metadata['source']}-{metadata['chunk_id']}", vector, {**metadata, "text": text})
+        for text, vector, metadata in zip(texts, vectors, metadatas)
+    ]
+    index.upsert(vectors=records, batch_size=batch_size)
+
+def _iter_chunks(pdf_directory, pdf_files, chunk_size, chunk_overlap):
+    """
+    Yield (chunk, metadata) pairs for every PDF as soon as its worker finishes
+    """
+    # Extraction + cleaning + chunking is CPU-bound and independent per PDF
+    pdf_paths = [os.path.join(pdf_directory, f) for f in pdf_files]
+    worker = partial(_process_pdf, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for pdf_file, chunks in zip(pdf_files, executor.map(worker, pdf_paths, chunksize=1)):
+            if not chunks:
+                print(f"No text extracted from {pdf_file}")
+                continue
+            
+            # Prepare metadata for each chunk
+            for i, chunk in enumerate(chunks):
+                yield chunk, {
+                    "source": pdf_file,
+                    "chunk_id": i,
+                    "page_content_length": len(chunk),
+                    "material_type": "general",  # Will be updated based on content analysis
+                    "compliance_type": "cpcb_2016"
+                }
+
+def _batched(iterable, size):
+    """
+    Yield lists of up to `size` items from an iterable
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def process_cpcb_documents(pdf_directory="./data/cpcb_pdfs/", chunk_size=1000, chunk_overlap=100):
+    """
+    Process CPCB documents: PDF extraction → text cleaning → chunking → embedding → Pinecone upsert
+    """
+    from langchain.vectorstores import Pinecone
+    
+    # Create or connect to index
+    index_name = os.getenv("PINECONE_INDEX_NAME", "cpcb-waste-rules")
+    index = _pinecone_index(index_name)
+    embeddings = _embeddings()
     
     # Process all PDFs in the directory
     pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
     
-    all_chunks = []
-    metadatas = []
+    # Stream chunks through embedding + upsert so memory stays bounded by one batch
+    # group rather than the whole corpus
+    total_chunks = 0
+    chunk_stream = _iter_chunks(pdf_directory, pdf_files, chunk_size, chunk_overlap)
+    for batch in _batched(chunk_stream, EMBED_BATCH_SIZE * EMBED_CONCURRENCY):
+        texts = [chunk for chunk, _ in batch]
+        metadatas = [metadata for _, metadata in batch]
+        vectors = asyncio.run(_embed_in_batches(embeddings, texts))
+        _upsert_vectors(index, texts, vectors, metadatas)
+        total_chunks += len(batch)
     
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(pdf_directory, pdf_file)
-        print(f"Processing {pdf_file}...")
-        
-        # Extract text from PDF
-        raw_text = extract_text_from_pdf(pdf_path)
-        if not raw_text:
-            print(f"No text extracted from {pdf_file}")
-            continue
-        
-        # Clean the text
-        cleaned_text = clean_text(raw_text)
-        
-        # Split text into chunks
-        chunks = text_splitter.split_text(cleaned_text)
-        
-        # Prepare metadata for each chunk
-        for i, chunk in enumerate(chunks):
-            all_chunks.append(chunk)
-            metadatas.append({
-                "source": pdf_file,
-                "chunk_id": i,
-                "page_content_length": len(chunk),
-                "material_type": "general",  # Will be updated based on content analysis
-                "compliance_type": "cpcb_2016"
-            })
-    
-    if all_chunks:
-        # Create Pinecone vectorstore
-        vectorstore = Pinecone.from_texts(
-            texts=all_chunks,
-            embedding=embeddings,
-            index_name=index_name,
-            metadatas=metadatas
-        )
+    if total_chunks:
+        vectorstore = Pinecone.from_existing_index(index_name, embeddings)
         
-        print(f"Ingested {len(all_chunks)} text chunks into Pinecone index '{index_name}'")
+        print(f"Ingested {total_chunks} text chunks into Pinecone index '{index_name}'")
         return vectorstore
     else:
         print("No chunks to ingest")
         return None
 
+def build_local_mirror():
+    """
+    Rebuild the app's local FAISS copy of the Pinecone index (RAG_LOCAL_MIRROR).
+    Copying every vector is slow, so it happens here rather than on the first query.
+    """
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from models.legal_rag import LegalComplianceRAG
+    
+    LegalComplianceRAG().build_local_mirror()
+    print("Local FAISS mirror rebuilt")
+
 def test_ingestion():
     """
     Test function to verify ingestion works correctly
     """
+    from langchain.vectorstores import Pinecone
+    
     # Create a sample text if no PDFs are available
     sample_cpcb_rules = """
     CENTRAL POLLUTION CONTROL BOARD
@@ -164,34 +316,13 @@ def test_ingestion():
     - Minimum thickness requirements for carry bags
     """
     
-    # Initialize Pinecone
-    pinecone.init(
-        api_key=os.getenv("PINECONE_API_KEY"),
-        environment=os.getenv("PINECONE_ENVIRONMENT")
-    )
-    
     # Create or connect to index
     index_name = os.getenv("PINECONE_INDEX_NAME", "cpcb-waste-rules")
-    
-    # Check if index exists, if not create it
-    if index_name not in pinecone.list_indexes():
-        pinecone.create_index(
-            name=index_name,
-            dimension=1536,  # OpenAI embedding dimension
-            metric='cosine'
-        )
-    
-    # Initialize embeddings
-    embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    _pinecone_index(index_name)
+    embeddings = _embeddings()
     
     # Split sample text into chunks
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=500,
-        chunk_overlap=50,
-        length_function=len,
-    )
-    
-    chunks = text_splitter.split_text(sample_cpcb_rules)
+    chunks = _text_splitter(500, 50).split_text(sample_cpcb_rules)
     
     # Prepare metadata
     metadatas = []
@@ -221,4 +352,7 @@ if __name__ == "__main__":
     
     # Run the test ingestion
     test_ingestion()
-    print("Sample CPCB rules ingested successfully!")
\ No newline at end of file
+    print("Sample CPCB rules ingested successfully!")
+    
+    if os.getenv("RAG_LOCAL_MIRROR", "0").strip().lower() in {"1", "true", "yes", "on"}:
+        build_local_mirror()
\ No newline at end of file
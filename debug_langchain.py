@@ -2,13 +2,21 @@
 import pkgutil
 import langchain
 import os
+import sys
 
 print(f"Langchain file: {langchain.__file__}")
 print(f"Langchain path: {langchain.__path__}")
 
+_FOUND = {}
+
 def find_retrieval_qa():
     import importlib
+    import importlib.util
     
+    if "RetrievalQA" in _FOUND:
+        print(f"FOUND RetrievalQA at: {_FOUND['RetrievalQA']}")
+        return
+
     # Try common locations
     candidates = [
         "langchain.chains.RetrievalQA",
@@ -20,8 +28,15 @@ def find_retrieval_qa():
     for candidate in candidates:
         try:
             module_name, class_name = candidate.rsplit('.', 1)
-            module = importlib.import_module(module_name)
+            # Already imported: no need to touch the import machinery
+            module = sys.modules.get(module_name)
+            if module is None:
+                # Confirm the module exists before paying for its side-effect imports
+                if importlib.util.find_spec(module_name) is None:
+                    continue
+                module = importlib.import_module(module_name)
             if hasattr(module, class_name):
+                _FOUND["RetrievalQA"] = candidate
                 print(f"FOUND RetrievalQA at: {candidate}")
                 return
         except ImportError:
@@ -1,15 +1,13 @@
-import os
-import requests
 import json
-from dotenv import load_dotenv
+from utils.env import env
+from utils.http import get_http_client
 
-load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
+api_key = env().get("GOOGLE_API_KEY")
 
 url = f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
 
 print(f"Listing Models for Key: {api_key[:10]}...")
-response = requests.get(url)
+response = get_http_client().get(url)
 
 if response.status_code == 200:
     models = response.json().get('models', [])
@@ -1,31 +1,146 @@
-﻿import os
-import json
-import re
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
-from utils.openrouter_config import (
-    get_openrouter_client,
-    get_openrouter_headers,
-    get_openrouter_model_text,
-    is_strict_genai
-)
+﻿import json
+import asyncio
+from string import Template
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+from utils.env import env
+from utils.http import per_event_loop
+from utils.llm_cache import get_llm_cache, make_cache_key
+from utils.retry import retry_with_backoff
+from utils.singleflight import SingleFlight
 
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_TTL_SECONDS = 86400
+# Bound in-flight requests in agenerate_many so the OpenRouter rate limit isn't tripped
+MAX_CONCURRENT_REQUESTS = 50
+# "openrouter" (default) or "gemini"; only the selected provider's SDK is imported
+LLM_BACKEND = env().get("LLM_BACKEND", "openrouter").strip().lower()
+
+INSTRUCTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "instructions": {"type": "array", "items": {"type": "string"}},
+        "do_not": {"type": "array", "items": {"type": "string"}},
+        "nudge": {"type": "string"}
+    },
+    "required": ["instructions", "do_not", "nudge"]
+}
+# Structured output: the provider guarantees an object with exactly these keys and types
+INSTRUCTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "disposal",
+        "strict": True,
+        "schema": {**INSTRUCTION_SCHEMA, "additionalProperties": False}
+    }
+}
+
+_inflight = SingleFlight()
+
+
+class DisposalInstructions(TypedDict):
+    instructions: List[str]
+    do_not: List[str]
+    # Filled in from the material analysis when the model leaves it out
+    nudge: NotRequired[str]
+
+
+_INSTRUCTIONS_ADAPTER = TypeAdapter(DisposalInstructions)
+
+GEMINI_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": INSTRUCTION_SCHEMA
+}
+
+# Parsed once at import; only the input fields are substituted per request
+_PROMPT_TMPL = Template("""
+You are Circular AI, a waste-to-resource assistant.
+Return STRICT JSON only with keys: instructions (list of strings), do_not (list of strings), nudge (string).
+Constraints:
+- Use ONLY the provided guidelines if available.
+- If hazardous is true, never suggest general bins or household disposal.
+- If hazardous, include PPE and authorized facility handling steps.
+- Keep instructions short and actionable.
+
+Inputs:
+material_type: $material_type
+description: $description
+city: $city
+hazardous: $hazardous
+risk_level: $risk_level
+guidelines: $guidelines
+""")
+
+
+def _embed_text(text: str) -> List[float]:
+    from utils.openrouter_config import get_openrouter_client, get_openrouter_embedding_model
+
+    response = get_openrouter_client().embeddings.create(
+        model=get_openrouter_embedding_model(),
+        input=text
+    )
+    return response.data[0].embedding
+
+
+def _as_list(value: Any) -> List[Any]:
+    if isinstance(value, list):
+        return value
+    return [str(value)] if value else []
+
+
+def _loads_or_none(text: str) -> Optional[Any]:
+    try:
+        if orjson is not None:
+            return orjson.loads(text)
+        return json.loads(text)
+    except ValueError:
+        # orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError
+        return None
 
 
 class InstructionGenerator:
     """
-    Generates step-by-step disposal instructions using Gemini with strict JSON output.
+    Generates step-by-step disposal instructions using OpenRouter or Gemini with strict JSON output.
     """
 
-    def __init__(self):
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        if not api_key:
-            raise ValueError("OPENROUTER_API_KEY not found in environment variables")
-        self.client = get_openrouter_client()
-        self.model_name = get_openrouter_model_text()
-        self.headers = get_openrouter_headers()
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = (backend or LLM_BACKEND).lower()
+        if self.backend == "gemini":
+            from utils.gemini_config import get_genai_client, get_gemini_model_name, is_strict_genai
+
+            self.client = get_genai_client()
+            # The async client's connection pool is bound to an event loop
+            self._async_client = per_event_loop(lambda: get_genai_client().aio)
+            self.model_name = get_gemini_model_name()
+            self.headers = {}
+            embed_fn = None
+        else:
+            from utils.openrouter_config import (
+                get_openrouter_client,
+                get_openrouter_async_client,
+                get_openrouter_headers,
+                get_openrouter_model_text,
+                get_openrouter_embedding_model,
+                is_strict_genai
+            )
+
+            api_key = env().get("OPENROUTER_API_KEY")
+            if not api_key:
+                raise ValueError("OPENROUTER_API_KEY not found in environment variables")
+            self.client = get_openrouter_client()
+            # Async clients are bound to an event loop, so this is resolved per call
+            self._async_client = get_openrouter_async_client
+            self.model_name = get_openrouter_model_text()
+            self.headers = get_openrouter_headers()
+            embed_fn = _embed_text if get_openrouter_embedding_model() else None
         self.strict = is_strict_genai()
+        # Semantic tier needs an embedding model; without one only exact hits are served
+        self.cache = get_llm_cache(embed_fn)
 
     def generate(
         self,
@@ -34,57 +149,295 @@ class InstructionGenerator:
         compliance_info: Dict[str, Any],
         city: Optional[str] = None
     ) -> Dict[str, Any]:
+        request = self._prepare_request(material_analysis, safety_assessment, compliance_info, city)
+        if request["cached"] is not None:
+            return request["cached"]
+
+        try:
+            data = self._parse_json(self._complete(request["prompt"]))
+            return self._handle_response(data, request, material_analysis, safety_assessment)
+        except Exception as e:
+            raise RuntimeError(f"{self._provider_name()} instruction generation failed: {e}")
+
+    async def agenerate(
+        self,
+        material_analysis: Dict[str, Any],
+        safety_assessment: Dict[str, Any],
+        compliance_info: Dict[str, Any],
+        city: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of generate() using the provider's async client.
+        """
+        # Cache lookups hit SQLite and may embed the query; keep them off the event loop
+        request = await asyncio.to_thread(
+            self._prepare_request, material_analysis, safety_assessment, compliance_info, city
+        )
+        if request["cached"] is not None:
+            return request["cached"]
+
+        try:
+            # Identical requests already in flight share one provider call
+            return await _inflight.do(
+                request["cache_key"],
+                lambda: self._agenerate_uncached(request, material_analysis, safety_assessment)
+            )
+        except Exception as e:
+            raise RuntimeError(f"{self._provider_name()} instruction generation failed: {e}")
+
+    async def _agenerate_uncached(
+        self,
+        request: Dict[str, Any],
+        material_analysis: Dict[str, Any],
+        safety_assessment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        data = self._parse_json(await self._acomplete(request["prompt"]))
+        return await asyncio.to_thread(self._handle_response, data, request, material_analysis, safety_assessment)
+
+    @retry_with_backoff()
+    def _complete(self, prompt: str) -> Optional[str]:
+        if self.backend == "gemini":
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=GEMINI_GENERATION_CONFIG
+            )
+            return response.text
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            extra_headers=self.headers,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=INSTRUCTION_RESPONSE_FORMAT
+        )
+        return response.choices[0].message.content
+
+    @retry_with_backoff()
+    async def _acomplete(self, prompt: str) -> Optional[str]:
+        if self.backend == "gemini":
+            response = await self._async_client().models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=GEMINI_GENERATION_CONFIG
+            )
+            return response.text
+        response = await self._async_client().chat.completions.create(
+            model=self.model_name,
+            extra_headers=self.headers,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=INSTRUCTION_RESPONSE_FORMAT
+        )
+        return response.choices[0].message.content
+
+    async def agenerate_stream(
+        self,
+        material_analysis: Dict[str, Any],
+        safety_assessment: Dict[str, Any],
+        compliance_info: Dict[str, Any],
+        city: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of agenerate() for progressive rendering.
+        Yields {"instructions": [...], "partial": True} each time another instruction
+        has been parsed from the stream (requires ijson), then the full normalized
+        result with "partial": False.
+        """
+        request = await asyncio.to_thread(
+            self._prepare_request, material_analysis, safety_assessment, compliance_info, city
+        )
+        if request["cached"] is not None:
+            yield {**request["cached"], "partial": False}
+            return
+
+        try:
+            import ijson
+            parsed = ijson.sendable_list()
+            parser = ijson.items_coro(parsed, "instructions.item")
+        except ImportError:
+            parser = None
+
+        chunks = []
+        instructions = []
+        try:
+            async for text in self._astream_completion(request["prompt"]):
+                chunks.append(text)
+                if parser is None:
+                    continue
+                try:
+                    parser.send(text.encode("utf-8"))
+                except Exception:
+                    # Malformed stream; the full-text parse below reports it
+                    parser = None
+                    continue
+                if parsed:
+                    instructions.extend(parsed)
+                    del parsed[:]
+                    yield {"instructions": list(instructions), "partial": True}
+
+            data = self._parse_json("".join(chunks))
+            result = await asyncio.to_thread(
+                self._handle_response, data, request, material_analysis, safety_assessment
+            )
+        except Exception as e:
+            raise RuntimeError(f"{self._provider_name()} instruction generation failed: {e}")
+        yield {**result, "partial": False}
+
+    async def _astream_completion(self, prompt: str) -> AsyncIterator[str]:
+        if self.backend == "gemini":
+            stream = await self._async_client().models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config=GEMINI_GENERATION_CONFIG
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        else:
+            stream = await self._async_client().chat.completions.create(
+                model=self.model_name,
+                extra_headers=self.headers,
+                messages=[{"role": "user", "content": prompt}],
+                response_format=INSTRUCTION_RESPONSE_FORMAT,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    def _provider_name(self) -> str:
+        return "Gemini" if self.backend == "gemini" else "OpenRouter"
+
+    async def agenerate_many(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Optional[str]]],
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> List[Any]:
+        """
+        Generate instructions for many (material_analysis, safety_assessment,
+        compliance_info, city) tuples concurrently. Results are returned in input
+        order; failed items are returned as the exception instead of raising.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(material_analysis, safety_assessment, compliance_info, city):
+            # Rate-limit retries happen inside _acomplete
+            async with semaphore:
+                return await self.agenerate(material_analysis, safety_assessment, compliance_info, city)
+
+        return await asyncio.gather(*(run_one(*item) for item in items), return_exceptions=True)
+
+    def _prepare_request(
+        self,
+        material_analysis: Dict[str, Any],
+        safety_assessment: Dict[str, Any],
+        compliance_info: Dict[str, Any],
+        city: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Build the prompt and cache keys, and check both cache tiers
+        """
         material_type = material_analysis.get("material_type", "unknown")
         description = material_analysis.get("description", "")
         hazardous = safety_assessment.get("is_hazardous", False)
         risk_level = safety_assessment.get("risk_level", "low")
         guidelines = compliance_info.get("guidelines", "")
 
-        prompt = f"""
-You are Circular AI, a waste-to-resource assistant.
-Return STRICT JSON only with keys: instructions (list of strings), do_not (list of strings), nudge (string).
-Constraints:
-- Use ONLY the provided guidelines if available.
-- If hazardous is true, never suggest general bins or household disposal.
-- If hazardous, include PPE and authorized facility handling steps.
-- Keep instructions short and actionable.
+        # Answers from another backend, model or prompt revision are never reused
+        generator = {
+            "backend": self.backend,
+            "model": self.model_name,
+            "prompt": _PROMPT_TMPL.template
+        }
+        request = {
+            "cache_key": make_cache_key({
+                **generator,
+                "material_type": material_type,
+                "description": description,
+                "city": city,
+                "hazardous": hazardous,
+                "risk_level": risk_level,
+                "guidelines": guidelines
+            }),
+            # Near-duplicate lookups only match items with the same generator, hazard
+            # classification, city and compliance guidelines; only the material text is
+            # compared by similarity
+            "semantic_text": f"{material_type} | {description} | {city or 'unknown'}",
+            "semantic_partition": "{}:{}:{}".format(
+                hazardous,
+                risk_level,
+                make_cache_key({**generator, "city": (city or "").strip().lower(), "guidelines": guidelines})
+            ),
+            "cached": None
+        }
 
-Inputs:
-material_type: {material_type}
-description: {description}
-city: {city or "unknown"}
-hazardous: {hazardous}
-risk_level: {risk_level}
-guidelines: {guidelines}
-"""
+        cached = self.cache.get(request["cache_key"])
+        if cached is None:
+            try:
+                cached = self.cache.get_similar(request["semantic_text"], request["semantic_partition"])
+            except Exception:
+                cached = None
+        if cached is not None:
+            request["cached"] = cached
+            return request
+
+        request["prompt"] = _PROMPT_TMPL.substitute(
+            material_type=material_type,
+            description=description,
+            city=city or "unknown",
+            hazardous=hazardous,
+            risk_level=risk_level,
+            guidelines=guidelines
+        )
+        return request
+
+    def _parse_json(self, content: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Parse the completion as JSON. Not every routed model honours response_format,
+        so fenced or prefixed replies fall back to the outermost {...} span.
+        Returns None unless one of them parses to an object.
+        """
+        content = content or ""
+        data = _loads_or_none(content)
+        if isinstance(data, dict):
+            return data
+
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end < start:
+            return None
+        data = _loads_or_none(content[start:end + 1])
+        return data if isinstance(data, dict) else None
 
+    def _handle_response(
+        self,
+        data: Optional[Dict[str, Any]],
+        request: Dict[str, Any],
+        material_analysis: Dict[str, Any],
+        safety_assessment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Normalize the parsed completion and store it in both cache tiers
+        """
+        if data is None:
+            raise RuntimeError(f"{self._provider_name()} returned non-JSON output.")
+
+        result = self._normalize_output(data, material_analysis, safety_assessment)
+        self.cache.set(request["cache_key"], result, ttl=CACHE_TTL_SECONDS)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                extra_headers=self.headers,
-                messages=[{"role": "user", "content": prompt}]
+            self.cache.add_similar(
+                request["semantic_text"], result, request["semantic_partition"], ttl=CACHE_TTL_SECONDS
             )
-            content = response.choices[0].message.content or ""
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(0))
-                return self._normalize_output(data, material_analysis, safety_assessment)
-            raise RuntimeError("OpenRouter returned non-JSON output.")
-        except Exception as e:
-            raise RuntimeError(f"OpenRouter instruction generation failed: {e}")
+        except Exception:
+            pass
+        return result
 
     def _normalize_output(self, data: Dict[str, Any], material_analysis: Dict[str, Any], safety_assessment: Dict[str, Any]) -> Dict[str, Any]:
-        instructions = data.get("instructions", [])
-        do_not = data.get("do_not", [])
-        nudge = data.get("nudge") or material_analysis.get("sustainability_nudge", "")
-
-        if not isinstance(instructions, list):
-            instructions = [str(instructions)] if instructions else []
-        if not isinstance(do_not, list):
-            do_not = [str(do_not)] if do_not else []
-
-        return {
-            "instructions": instructions,
-            "do_not": do_not,
-            "nudge": nudge
-        }
+        try:
+            data = _INSTRUCTIONS_ADAPTER.validate_python(data)
+        except ValidationError:
+            # Provider ignored the response schema; coerce the fields we need
+            data = {
+                "instructions": _as_list(data.get("instructions")),
+                "do_not": _as_list(data.get("do_not")),
+                "nudge": data.get("nudge")
+            }
+        return {**data, "nudge": data.get("nudge") or material_analysis.get("sustainability_nudge", "")}
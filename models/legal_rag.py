@@ -1,14 +1,203 @@
 import os
-from dotenv import load_dotenv
+import re
+import asyncio
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 from langchain_pinecone import PineconeVectorStore
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from utils.openrouter_config import get_openrouter_model_text, get_openrouter_embedding_model, is_strict_genai
+from utils.http import get_http_client, get_async_http_client, per_event_loop
+from utils.env import env
+from utils.retry import retry_with_backoff
+from utils.singleflight import SingleFlight
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
+from langchain_core.runnables import RunnablePassthrough, RunnableParallel, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+# Embedding vectors for repeated queries/chunks are persisted here between runs
+EMBEDDING_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", ".cache", "embeddings"
+)
+RETRIEVAL_CACHE_SIZE = 1024
+# Local FAISS mirror of the Pinecone index (see LegalComplianceRAG.vectorstore)
+LOCAL_INDEX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", ".cache", "faiss"
+)
+# Each build goes to its own versioned directory; CURRENT names the live one and is
+# swapped with a single os.replace, so readers see either the old or the new mirror
+MIRROR_POINTER_FILE = os.path.join(LOCAL_INDEX_DIR, "CURRENT")
+MIRROR_LOCK_FILE = os.path.join(LOCAL_INDEX_DIR, "build.lock")
+MIRROR_VERSIONS_KEPT = 2
+QUANTIZED_INDEX_MIN_VECTORS = 1000
+HNSW_M = 32
+
+_inflight = SingleFlight()
+# One mirror build at a time in this process; MIRROR_LOCK_FILE covers other processes
+_mirror_build_lock = threading.Lock()
+
+
+def _chat_model(**http_clients) -> ChatOpenAI:
+    return ChatOpenAI(
+        model=get_openrouter_model_text(),
+        temperature=0,
+        api_key=env().get("OPENROUTER_API_KEY"),
+        base_url=env().get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+        # Chain calls are retried by retry_with_backoff; SDK retries would multiply them
+        max_retries=0,
+        **http_clients
+    )
+
+
+@per_event_loop
+def _async_chat_model() -> ChatOpenAI:
+    # The async client's pooled connections belong to the running loop
+    return _chat_model(http_client=get_http_client(), http_async_client=get_async_http_client())
+
+try:
+    # RE2 matches in linear time with a DFA, no backtracking on the lazy .*? patterns
+    import re2
+except ImportError:
+    re2 = None
+
+
+def _compile_pattern(pattern: str):
+    """
+    Compile a case-insensitive extraction pattern with RE2 when available, else re
+    """
+    if re2 is not None:
+        try:
+            return re2.compile('(?i)' + pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Extraction patterns for LLM answers, compiled once at import
+# The compliance keyword groups are plain alternations, so one combined pattern
+# finds the same matches in a single pass
+_COMPLIANCE_PATTERNS = (
+    _compile_pattern(r'(compliance|requirement|must|shall|should|obligation|duty|responsibility|section|chapter|rule|regulation|clause|penalty|fine|punishment|consequence|within \d+ days|monthly|annual|periodic)'),
+)
+_CITATION_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(Section \d+[A-Z]?)',
+    r'(Chapter \d+)',
+    r'(Rule \d+[A-Z]?)',
+    r'(Schedule [IVX]+)',
+    r'(Annexure [IVX]+)',
+))
+_REGULATORY_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(CPCB.*?2016)',
+    r'(Solid Waste Management Rules.*?2016)',
+    r'(Hazardous and Other Wastes Rules.*?2016)',
+    r'(Bio-medical Waste Management Rules.*?2016)',
+    r'(E-Waste Management Rules.*?2016)',
+    r'(Environment Protection Act.*?1986)',
+))
+_MANDATORY_STEP_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(must.*?)(?:\.|\n)',
+    r'(shall.*?)(?:\.|\n)',
+    r'(required to.*?)(?:\.|\n)',
+    r'(need to.*?)(?:\.|\n)',
+    r'(procedure.*?)(?:\.|\n)',
+))
+_AUTHORIZED_ENTITY_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(authorized.*?handler)',
+    r'(certified.*?facility)',
+    r'(licensed.*?operator)',
+    r'(government approved.*?entity)',
+    r'(CPCB authorized)',
+    r'(State PCB recognized)',
+))
+_COLLECTION_TARGET_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(\d+%\s*(?:of|for|collection))',
+    r'(\d+\s*(?:tons|tonnes|kg)\s*(?:per|target))',
+    r'(collection target.*?\d+%)',
+    r'((?:minimum|maximum)\s*\d+%\s*(?:collection|recovery))',
+))
+_REPORTING_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(report.*?(?:quarterly|annual|monthly|yearly))',
+    r'(submit.*?report)',
+    r'(documentation.*?requirement)',
+    r'(record keeping.*?)(?:\.|\n)',
+))
+_PENALTY_PATTERNS = tuple(_compile_pattern(p) for p in (
+    r'(penalty.*?\d+)',
+    r'(fine.*?Rs)',
+    r'(imprisonment|jail|custody)',
+    r'(Section \d+.*?penalty)',
+))
+
+# Static CPCB responses for the rate-limited path, keyed by material keywords
+_PLASTIC_FALLBACK = MappingProxyType({
+    "guidelines": "As per PWM Rules 2016, Section 5: Plastic waste must be segregated at source. PET bottles should be cleaned, crushed, and handed over to authorized recyclers. Burning is strictly prohibited.",
+    "sources": ("CPCB Plastic Waste Management Rules, 2016",),
+    "compliance_requirements": ("Segregation at Source", "No Burning"),
+    "citations": ("Rule 5(1)", "Rule 6")
+})
+_EWASTE_FALLBACK = MappingProxyType({
+    "guidelines": "As per E-Waste Rules 2016: Consumers must channel e-waste to authorized collection centers or recycler. Do not mix with municipal solid waste.",
+    "sources": ("E-Waste (Management) Rules, 2016",),
+    "compliance_requirements": ("Deposit at Collection Center", "No Dismantling by Informal Sector"),
+    "citations": ("Schedule I", "Rule 4")
+})
+_PAPER_FALLBACK = MappingProxyType({
+    "guidelines": "Solid Waste Management Rules 2016: Biodegradable and non-biodegradable waste must be segregated. Dry paper waste should be sent for material recovery.",
+    "sources": ("SWM Rules, 2016",),
+    "compliance_requirements": ("Dry Waste Segregation",),
+    "citations": ("Rule 15",)
+})
+_DEFAULT_FALLBACK = MappingProxyType({
+    "guidelines": "General SWM Rules 2016: Segregate into Wet (Green Bin), Dry (Blue Bin), and Hazardous (Red Bin) fractions. Hand over to heavy authorized collectors.",
+    "sources": ("Solid Waste Management Rules, 2016",),
+    "compliance_requirements": ("3-Way Segregation",),
+    "citations": ("Rule 15",)
+})
+_FALLBACK_TABLE = (
+    (("plastic", "pet", "bottle"), _PLASTIC_FALLBACK),
+    (("ewaste", "electronic", "circuit"), _EWASTE_FALLBACK),
+    (("cardboard", "paper"), _PAPER_FALLBACK),
+)
+_FALLBACK_KEYWORD_ROW = MappingProxyType({
+    keyword: row for row, (keywords, _) in enumerate(_FALLBACK_TABLE) for keyword in keywords
+})
+# One pass over the material name finds every keyword
+_FALLBACK_KEYWORD_RE = re.compile("|".join(map(re.escape, _FALLBACK_KEYWORD_ROW)))
+
+def _current_mirror_dir() -> Optional[str]:
+    try:
+        with open(MIRROR_POINTER_FILE, "r", encoding="utf-8") as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    path = os.path.join(LOCAL_INDEX_DIR, name)
+    return path if name and os.path.isdir(path) else None
+
+
+def _publish_mirror_dir(version_dir: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=LOCAL_INDEX_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(os.path.basename(version_dir))
+    os.replace(tmp_path, MIRROR_POINTER_FILE)
+
+
+def _prune_mirror_versions(current_dir: str) -> None:
+    # Keep the previous version too: a reader may have resolved CURRENT just before the swap
+    versions = sorted(
+        (entry.path for entry in os.scandir(LOCAL_INDEX_DIR) if entry.is_dir() and entry.name.startswith("v")),
+        key=os.path.getmtime,
+        reverse=True
+    )
+    for path in versions[MIRROR_VERSIONS_KEPT:]:
+        if path != current_dir:
+            shutil.rmtree(path, ignore_errors=True)
 
-load_dotenv()
 
 class LegalComplianceRAG:
     """
@@ -18,48 +207,168 @@ class LegalComplianceRAG:
     """
     
     def __init__(self):
-        # Initialize Gemini LLM
-        self.llm = ChatOpenAI(
-            model=get_openrouter_model_text(),
-            temperature=0,
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-        )
+        # Clients, the Pinecone connection and the chain are built on first use
         self.strict = is_strict_genai()
-        
+        self.index_name = env().get("PINECONE_INDEX_NAME", "cpcb-waste-rules")
+        self.prompt = self._create_legal_prompt()
+
+        # Same material query -> same top-k chunks; skip the embedding + Pinecone round trip
+        self._retrieve_cached = lru_cache(maxsize=RETRIEVAL_CACHE_SIZE)(self._retrieve_uncached)
+
+    @cached_property
+    def llm(self):
+        # Sync calls only; async chain runs go through _async_chat_model()
+        return _chat_model(http_client=get_http_client())
+
+    def _invoke_llm(self, prompt):
+        return self.llm.invoke(prompt)
+
+    async def _ainvoke_llm(self, prompt):
+        return await _async_chat_model().ainvoke(prompt)
+
+    @cached_property
+    def embeddings(self):
+        embedding_model = get_openrouter_embedding_model()
+        if not embedding_model:
+            raise Exception("OPENROUTER_EMBEDDING_MODEL not set")
+        return self._cache_embeddings(
+            OpenAIEmbeddings(
+                model=embedding_model,
+                api_key=env().get("OPENROUTER_API_KEY"),
+                base_url=env().get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+                # Retrieval embeds on the sync path only (see _aretrieve_docs)
+                http_client=get_http_client(),
+                max_retries=0
+            ),
+            namespace=embedding_model
+        )
+
+    @cached_property
+    def vectorstore(self):
+        # Opt-in in-process FAISS mirror; Pinecone is the source of truth and the fallback
+        if env().get("RAG_LOCAL_MIRROR", "0").strip().lower() in {"1", "true", "yes", "on"}:
+            try:
+                return self._load_local_mirror()
+            except Exception as e:
+                print(f"RAG Mirror Warning: {e}. Querying Pinecone directly.")
+        return PineconeVectorStore.from_existing_index(
+            index_name=self.index_name,
+            embedding=self.embeddings
+        )
+
+    def _load_local_mirror(self):
+        """
+        Load the local FAISS copy of the Pinecone index. It is never built here:
+        copying the whole index is far too slow for a user request, so it is
+        built offline by data/ingest_cpcb.py (see build_local_mirror).
+        """
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+
+        mirror_dir = _current_mirror_dir()
+        if mirror_dir is None:
+            raise FileNotFoundError(f"No local mirror at {LOCAL_INDEX_DIR}; run data/ingest_cpcb.py to build it")
+
+        return FAISS.load_local(
+            mirror_dir,
+            self.embeddings,
+            allow_dangerous_deserialization=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+
+    def build_local_mirror(self):
+        """
+        Copy every vector in the Pinecone index into a local FAISS inner-product index,
+        int8-quantized HNSW once the corpus is large enough. Only one build runs
+        at a time; a concurrent build in another process makes this one fail.
+        """
+        os.makedirs(LOCAL_INDEX_DIR, exist_ok=True)
+        with _mirror_build_lock:
+            try:
+                lock_fd = os.open(MIRROR_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                raise RuntimeError(f"Another mirror build is running (remove {MIRROR_LOCK_FILE} if it is stale)")
+            try:
+                self._build_local_mirror_locked()
+            finally:
+                os.close(lock_fd)
+                os.remove(MIRROR_LOCK_FILE)
+
+    def _build_local_mirror_locked(self):
+        import faiss
+        import numpy as np
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+        from langchain_core.documents import Document
+        from pinecone import Pinecone
+
+        index = Pinecone(api_key=env().get("PINECONE_API_KEY")).Index(self.index_name)
+        texts, vectors, metadatas = [], [], []
+        # list() pages through every vector id (serverless indexes)
+        for ids in index.list():
+            for record in index.fetch(ids=list(ids)).vectors.values():
+                metadata = dict(record.metadata or {})
+                texts.append(metadata.pop("text", ""))
+                vectors.append(record.values)
+                metadatas.append(metadata)
+        if not texts:
+            raise RuntimeError(f"Pinecone index {self.index_name} is empty")
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if len(matrix) >= QUANTIZED_INDEX_MIN_VECTORS:
+            # int8 scalar quantization stores 4x less than float32; HNSW avoids the full scan
+            index = faiss.IndexHNSWSQ(matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.train(matrix)
+        else:
+            # Small corpora: exact search is already microseconds
+            index = faiss.IndexFlatIP(matrix.shape[1])
+        index.add(matrix)
+
+        doc_ids = [str(i) for i in range(len(texts))]
+        store = FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore({
+                doc_id: Document(page_content=text, metadata=metadata)
+                for doc_id, text, metadata in zip(doc_ids, texts, metadatas)
+            }),
+            index_to_docstore_id=dict(enumerate(doc_ids)),
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+        # Save to a fresh version directory, then repoint CURRENT at it in one step
+        version_dir = tempfile.mkdtemp(prefix=time.strftime("v%Y%m%d%H%M%S-"), dir=LOCAL_INDEX_DIR)
+        store.save_local(version_dir)
+        _publish_mirror_dir(version_dir)
+        _prune_mirror_versions(version_dir)
+
+    @cached_property
+    def retriever(self):
         # Try to connect to Vector DB, else Fallback to LLM-only
-        self.use_rag = False
         try:
-            self.index_name = os.getenv("PINECONE_INDEX_NAME", "cpcb-waste-rules")
-            embedding_model = get_openrouter_embedding_model()
-            if not embedding_model:
-                raise Exception("OPENROUTER_EMBEDDING_MODEL not set")
-            self.embeddings = OpenAIEmbeddings(
-                model=embedding_model,
-                api_key=os.getenv("OPENROUTER_API_KEY"),
-                base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-            )
-            
-            self.vectorstore = PineconeVectorStore.from_existing_index(
-                index_name=self.index_name,
-                embedding=self.embeddings
-            )
-            self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": 4})
-            self.use_rag = True
+            return self.vectorstore.as_retriever(search_kwargs={"k": 4})
         except Exception as e:
             print(f"RAG Config Warning: {e}. Switching to LLM-only mode.")
-            self.retriever = None
+            return None
 
+    @cached_property
+    def use_rag(self) -> bool:
+        return self.retriever is not None
+
+    @cached_property
+    def _llm_step(self):
+        return RunnableLambda(self._invoke_llm, afunc=self._ainvoke_llm)
+
+    @cached_property
+    def qa_chain(self):
         # Create QA chain or simple Chain
-        self.prompt = self._create_legal_prompt()
-        
         if self.use_rag:
             def format_docs(docs):
                 return "\n\n".join(doc.page_content for doc in docs)
 
-            self.qa_chain = (
+            return (
                 RunnableParallel({
-                    "context": (lambda x: x["query"]) | self.retriever,
+                    "context": (lambda x: x["query"]) | RunnableLambda(self._retrieve_docs, afunc=self._aretrieve_docs),
                     "question": lambda x: x["query"]
                 })
                 .assign(answer=(
@@ -67,22 +376,67 @@ class LegalComplianceRAG:
                         context=(lambda x: format_docs(x["context"]))
                     )
                     | self.prompt
-                    | self.llm
+                    | self._llm_step
                     | StrOutputParser()
                 ))
             )
-        else:
-            # Fallback Chain: Just LLM without context
-            self.qa_chain = (
-                RunnableParallel({
-                    "context": lambda x: "Context unavailable (LLM Mode)",
-                    "question": lambda x: x["query"]
-                })
-                | self.prompt
-                | self.llm
-                | StrOutputParser()
-            )
+
+        # Fallback Chain: Just LLM without context
+        return (
+            RunnableParallel({
+                "context": lambda x: "Context unavailable (LLM Mode)",
+                "question": lambda x: x["query"]
+            })
+            | self.prompt
+            | self._llm_step
+            | StrOutputParser()
+        )
     
+    def _cache_embeddings(self, embeddings, namespace: str):
+        """
+        Wrap embeddings with a local file-backed cache, if LangChain's cache helpers are available
+        """
+        try:
+            from langchain.embeddings import CacheBackedEmbeddings
+            from langchain.storage import LocalFileStore
+        except ImportError:
+            return embeddings
+
+        store = LocalFileStore(EMBEDDING_CACHE_DIR)
+        return CacheBackedEmbeddings.from_bytes_store(
+            embeddings,
+            store,
+            namespace=namespace,
+            query_embedding_cache=True
+        )
+
+    @retry_with_backoff()
+    def _invoke_chain(self, query: str) -> Dict:
+        return self.qa_chain.invoke({"query": query})
+
+    async def _ainvoke_chain(self, query: str) -> Dict:
+        # Identical queries already in flight share one retrieval + LLM run
+        return await _inflight.do(query, lambda: self._ainvoke_chain_with_retry(query))
+
+    @retry_with_backoff()
+    async def _ainvoke_chain_with_retry(self, query: str) -> Dict:
+        return await self.qa_chain.ainvoke({"query": query})
+
+    def _retrieve_uncached(self, query_key: str, query: str):
+        # Not retried here: chain calls already retry as a whole, and nesting would multiply attempts
+        return tuple(self.retriever.invoke(query))
+
+    def _retrieve_docs(self, query: str) -> List[Any]:
+        """
+        Retrieve top-k documents for a query, memoized on a hash of the query text
+        """
+        query_key = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        return list(self._retrieve_cached(query_key, query))
+
+    async def _aretrieve_docs(self, query: str) -> List[Any]:
+        # Share the sync LRU; the blocking lookup runs off the event loop
+        return await asyncio.to_thread(self._retrieve_docs, query)
+
     def _create_legal_prompt(self):
         """
         Create a custom prompt template for legal compliance queries
@@ -115,106 +469,118 @@ class LegalComplianceRAG:
         Get CPCB-compliant disposal guidelines for a specific material type.
         Includes robust fallback for API Rate Limits (429).
         """
-        query = f"What are the CPCB guidelines for disposing of {material_type} waste according to the 2016 Waste Management Rules?"
-        
         try:
             # Check if LLM is available (RAG might be disabled)
             if not self.qa_chain:
                 raise Exception("LLM Chain not initialized")
 
-            result = self.qa_chain.invoke({"query": query})
-            
-            # Map LCEL output to legacy expected format
-            answer = result.get("answer", "No guidelines found")
-            source_docs = result.get("context", [])
-            
-            return {
-                "material_type": material_type,
-                "guidelines": answer,
-                "sources": [doc.metadata.get("source", "Unknown") for doc in source_docs] if isinstance(source_docs, list) else ["AI Knowledge Base"],
-                "compliance_requirements": self._extract_compliance_info(answer),
-                "citations": self._extract_section_citations(answer)
-            }
+            result = self._invoke_chain(self._disposal_query(material_type))
+            return self._format_disposal_guidelines(material_type, result)
         except Exception as e:
-            # Check for Rate Limit (429) or other API errors
-            error_str = str(e)
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                print(f"⚠️ Legal RAG Rate Limit/Quota Hit: {e}")
-                
-                # FALLBACK: Static rule-based response for demo continuity
-                raise RuntimeError("Legal RAG fallback disabled in strict GenAI mode.")
-            
-            return {
-                "material_type": material_type,
-                "guidelines": f"Compliance check temporarily unavailable (Network/API Error).",
-                "sources": [],
-                "compliance_requirements": [],
-                "citations": []
-            }
+            return self._disposal_error(material_type, e)
+
+    async def aget_disposal_guidelines(self, material_type: str) -> Dict:
+        """
+        Async variant of get_disposal_guidelines
+        """
+        try:
+            if not self.qa_chain:
+                raise Exception("LLM Chain not initialized")
+
+            result = await self._ainvoke_chain(self._disposal_query(material_type))
+            return self._format_disposal_guidelines(material_type, result)
+        except Exception as e:
+            return self._disposal_error(material_type, e)
+
+    def _disposal_query(self, material_type: str) -> str:
+        return f"What are the CPCB guidelines for disposing of {material_type} waste according to the 2016 Waste Management Rules?"
+
+    def _format_disposal_guidelines(self, material_type: str, result: Dict) -> Dict:
+        # Map LCEL output to legacy expected format
+        answer = result.get("answer", "No guidelines found")
+        source_docs = result.get("context", [])
+
+        return {
+            "material_type": material_type,
+            "guidelines": answer,
+            "sources": [doc.metadata.get("source", "Unknown") for doc in source_docs] if isinstance(source_docs, list) else ["AI Knowledge Base"],
+            "compliance_requirements": self._extract_compliance_info(answer),
+            "citations": self._extract_section_citations(answer)
+        }
+
+    def _disposal_error(self, material_type: str, e: Exception) -> Dict:
+        # Check for Rate Limit (429) or other API errors
+        error_str = str(e)
+        if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+            print(f"⚠️ Legal RAG Rate Limit/Quota Hit: {e}")
+
+            # FALLBACK: Static rule-based response for demo continuity
+            raise RuntimeError("Legal RAG fallback disabled in strict GenAI mode.")
+
+        return {
+            "material_type": material_type,
+            "guidelines": f"Compliance check temporarily unavailable (Network/API Error).",
+            "sources": [],
+            "compliance_requirements": [],
+            "citations": []
+        }
 
     def _get_static_compliance_fallback(self, material_type):
         """
         Provides static, verified CPCB data when API is rate-limited.
         """
-        m_lower = material_type.lower()
-        if "plastic" in m_lower or "pet" in m_lower or "bottle" in m_lower:
-            return {
-                "material_type": material_type,
-                "guidelines": "As per PWM Rules 2016, Section 5: Plastic waste must be segregated at source. PET bottles should be cleaned, crushed, and handed over to authorized recyclers. Burning is strictly prohibited.",
-                "sources": ["CPCB Plastic Waste Management Rules, 2016"],
-                "compliance_requirements": ["Segregation at Source", "No Burning"],
-                "citations": ["Rule 5(1)", "Rule 6"]
-            }
-        elif "ewaste" in m_lower or "electronic" in m_lower or "circuit" in m_lower:
-             return {
-                "material_type": material_type,
-                "guidelines": "As per E-Waste Rules 2016: Consumers must channel e-waste to authorized collection centers or recycler. Do not mix with municipal solid waste.",
-                "sources": ["E-Waste (Management) Rules, 2016"],
-                "compliance_requirements": ["Deposit at Collection Center", "No Dismantling by Informal Sector"],
-                "citations": ["Schedule I", "Rule 4"]
-            }
-        elif "cardboard" in m_lower or "paper" in m_lower:
-             return {
-                "material_type": material_type,
-                "guidelines": "Solid Waste Management Rules 2016: Biodegradable and non-biodegradable waste must be segregated. Dry paper waste should be sent for material recovery.",
-                "sources": ["SWM Rules, 2016"],
-                "compliance_requirements": ["Dry Waste Segregation"],
-                "citations": ["Rule 15"]
-            }
-        else:
-             return {
-                "material_type": material_type,
-                "guidelines": "General SWM Rules 2016: Segregate into Wet (Green Bin), Dry (Blue Bin), and Hazardous (Red Bin) fractions. Hand over to heavy authorized collectors.",
-                "sources": ["Solid Waste Management Rules, 2016"],
-                "compliance_requirements": ["3-Way Segregation"],
-                "citations": ["Rule 15"]
-            }
+        # Earlier table rows win, matching the original if/elif priority
+        rows = {_FALLBACK_KEYWORD_ROW[kw] for kw in _FALLBACK_KEYWORD_RE.findall(material_type.lower())}
+        fallback = _FALLBACK_TABLE[min(rows)][1] if rows else _DEFAULT_FALLBACK
+        return {
+            "material_type": material_type,
+            "guidelines": fallback["guidelines"],
+            "sources": list(fallback["sources"]),
+            "compliance_requirements": list(fallback["compliance_requirements"]),
+            "citations": list(fallback["citations"])
+        }
 
     def get_hazardous_material_protocol(self, material_description: str) -> Dict:
         """
         Get specific protocols for hazardous materials
         """
-        query = f"What are the emergency handling and disposal protocols for {material_description} under CPCB 2016 hazardous waste rules?"
-        
         try:
-            result = self.qa_chain.invoke({"query": query})
-            
-            answer = result.get("answer", "No protocols found")
-            return {
-                "material_description": material_description,
-                "emergency_protocols": answer,
-                "regulatory_references": self._extract_regulatory_refs(answer),
-                "mandatory_steps": self._extract_mandatory_steps(answer),
-                "authorized_handlers": self._extract_authorized_entities(answer)
-            }
-        except Exception as e:
-            return {
-                "material_description": material_description,
-                "emergency_protocols": "Standard Hazard Protocol: Isolate material, wear PPE, contact authorized hazardous waste handler.",
-                "regulatory_references": ["Hazardous Waste Rules 2016"],
-                "mandatory_steps": ["Do not touch with bare hands", "Segregate"],
-                "authorized_handlers": ["TSDF Operators"]
-            }
+            result = self._invoke_chain(self._hazardous_query(material_description))
+            return self._format_hazardous_protocol(material_description, result)
+        except Exception:
+            return self._hazardous_protocol_fallback(material_description)
+
+    async def aget_hazardous_material_protocol(self, material_description: str) -> Dict:
+        """
+        Async variant of get_hazardous_material_protocol
+        """
+        try:
+            result = await self._ainvoke_chain(self._hazardous_query(material_description))
+            return self._format_hazardous_protocol(material_description, result)
+        except Exception:
+            return self._hazardous_protocol_fallback(material_description)
+
+    def _hazardous_query(self, material_description: str) -> str:
+        return f"What are the emergency handling and disposal protocols for {material_description} under CPCB 2016 hazardous waste rules?"
+
+    def _format_hazardous_protocol(self, material_description: str, result: Dict) -> Dict:
+        answer = result.get("answer", "No protocols found")
+        return {
+            "material_description": material_description,
+            "emergency_protocols": answer,
+            "regulatory_references": self._extract_regulatory_refs(answer),
+            "mandatory_steps": self._extract_mandatory_steps(answer),
+            "authorized_handlers": self._extract_authorized_entities(answer)
+        }
+
+    def _hazardous_protocol_fallback(self, material_description: str) -> Dict:
+        return {
+            "material_description": material_description,
+            "emergency_protocols": "Standard Hazard Protocol: Isolate material, wear PPE, contact authorized hazardous waste handler.",
+            "regulatory_references": ["Hazardous Waste Rules 2016"],
+            "mandatory_steps": ["Do not touch with bare hands", "Segregate"],
+            "authorized_handlers": ["TSDF Operators"]
+        }
     
     def get_extended_producer_responsibility_info(self, product_category: str) -> Dict:
         """
@@ -226,27 +592,43 @@ class LegalComplianceRAG:
         Returns:
             Dict with EPR obligations and compliance info
         """
-        query = f"What are the Extended Producer Responsibility (EPR) obligations for {product_category} under CPCB 2016 rules?"
-        
         try:
-            result = self.qa_chain.invoke({"query": query})
-            
-            answer = result.get("answer", "No EPR info found")
-            return {
-                "product_category": product_category,
-                "epr_obligations": answer,
-                "collection_targets": self._extract_collection_targets(answer),
-                "reporting_requirements": self._extract_reporting_reqs(answer),
-                "penalty_structure": self._extract_penalty_info(answer)
-            }
+            result = self._invoke_chain(self._epr_query(product_category))
+            return self._format_epr_info(product_category, result)
         except Exception as e:
-            return {
-                "product_category": product_category,
-                "epr_obligations": f"Error retrieving EPR info: {str(e)}",
-                "collection_targets": [],
-                "reporting_requirements": [],
-                "penalty_structure": []
-            }
+            return self._epr_error(product_category, e)
+
+    async def aget_extended_producer_responsibility_info(self, product_category: str) -> Dict:
+        """
+        Async variant of get_extended_producer_responsibility_info
+        """
+        try:
+            result = await self._ainvoke_chain(self._epr_query(product_category))
+            return self._format_epr_info(product_category, result)
+        except Exception as e:
+            return self._epr_error(product_category, e)
+
+    def _epr_query(self, product_category: str) -> str:
+        return f"What are the Extended Producer Responsibility (EPR) obligations for {product_category} under CPCB 2016 rules?"
+
+    def _format_epr_info(self, product_category: str, result: Dict) -> Dict:
+        answer = result.get("answer", "No EPR info found")
+        return {
+            "product_category": product_category,
+            "epr_obligations": answer,
+            "collection_targets": self._extract_collection_targets(answer),
+            "reporting_requirements": self._extract_reporting_reqs(answer),
+            "penalty_structure": self._extract_penalty_info(answer)
+        }
+
+    def _epr_error(self, product_category: str, e: Exception) -> Dict:
+        return {
+            "product_category": product_category,
+            "epr_obligations": f"Error retrieving EPR info: {str(e)}",
+            "collection_targets": [],
+            "reporting_requirements": [],
+            "penalty_structure": []
+        }
     
     def search_similar_cases(self, scenario_description: str) -> List[Dict]:
         """
@@ -259,187 +641,124 @@ class LegalComplianceRAG:
             List of similar cases with compliance guidance
         """
         try:
-            docs = self.retriever.invoke(scenario_description)
-            
-            similar_cases = []
-            for doc in docs:
-                similar_cases.append({
-                    "content": doc.page_content[:500] + "..." if len(doc.page_content) > 500 else doc.page_content,
-                    "source": doc.metadata.get("source", "Unknown"),
-                    "similarity_score": doc.metadata.get("similarity", 0.0)
-                })
-            
-            return similar_cases
+            docs = self._retrieve_docs(scenario_description)
+            return self._format_similar_cases(docs)
         except Exception as e:
             return [{"error": f"Error searching similar cases: {str(e)}"}]
+
+    async def asearch_similar_cases(self, scenario_description: str) -> List[Dict]:
+        """
+        Async variant of search_similar_cases
+        """
+        try:
+            docs = await self._aretrieve_docs(scenario_description)
+            return self._format_similar_cases(docs)
+        except Exception as e:
+            return [{"error": f"Error searching similar cases: {str(e)}"}]
+
+    def _format_similar_cases(self, docs) -> List[Dict]:
+        similar_cases = []
+        for doc in docs:
+            similar_cases.append({
+                "content": doc.page_content[:500] + "..." if len(doc.page_content) > 500 else doc.page_content,
+                "source": doc.metadata.get("source", "Unknown"),
+                "similarity_score": doc.metadata.get("similarity", 0.0)
+            })
+
+        return similar_cases
+
+    async def aget_full_profile(self, material_type: str) -> Dict:
+        """
+        Run the disposal, hazardous protocol, EPR and similar-case lookups for one
+        material concurrently, so the Pinecone and LLM round trips overlap.
+
+        Returns:
+            Dict with one entry per lookup
+        """
+        disposal, hazardous, epr, similar = await asyncio.gather(
+            self.aget_disposal_guidelines(material_type),
+            self.aget_hazardous_material_protocol(material_type),
+            self.aget_extended_producer_responsibility_info(material_type),
+            self.asearch_similar_cases(material_type)
+        )
+        return {
+            "disposal_guidelines": disposal,
+            "hazardous_protocol": hazardous,
+            "epr_info": epr,
+            "similar_cases": similar
+        }
+
+    def get_full_profile(self, material_type: str) -> Dict:
+        """
+        Sync variant of aget_full_profile. The lookups run on the sync chain in
+        worker threads, so no event loop is created per call.
+        """
+        try:
+            # Build the chain (and vector store) once, before the workers share it
+            self.qa_chain
+        except Exception:
+            # Each lookup reports the failure in its own result
+            pass
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            disposal = pool.submit(self.get_disposal_guidelines, material_type)
+            hazardous = pool.submit(self.get_hazardous_material_protocol, material_type)
+            epr = pool.submit(self.get_extended_producer_responsibility_info, material_type)
+            similar = pool.submit(self.search_similar_cases, material_type)
+            return {
+                "disposal_guidelines": disposal.result(),
+                "hazardous_protocol": hazardous.result(),
+                "epr_info": epr.result(),
+                "similar_cases": similar.result()
+            }
     
     def _extract_compliance_info(self, text: str) -> List[str]:
         """
         Extract compliance-related information from the response
         """
-        import re
-        
-        compliance_keywords = [
-            r'(compliance|requirement|must|shall|should|obligation|duty|responsibility)',
-            r'(section|chapter|rule|regulation|clause)',
-            r'(penalty|fine|punishment|consequence)',
-            r'(within \d+ days|monthly|annual|periodic)'
-        ]
-        
-        matches = []
-        for pattern in compliance_keywords:
-            found = re.findall(pattern, text, re.IGNORECASE)
-            matches.extend(found)
-        
-        return list(set(matches))  # Remove duplicates
+        return list({match for pattern in _COMPLIANCE_PATTERNS for match in pattern.findall(text)})
     
     def _extract_section_citations(self, text: str) -> List[str]:
         """
         Extract section/chapter citations from the response
         """
-        import re
-        
-        # Patterns for various citation formats
-        citation_patterns = [
-            r'(Section \d+[A-Z]?)',
-            r'(Chapter \d+)',
-            r'(Rule \d+[A-Z]?)',
-            r'(Schedule [IVX]+)',
-            r'(Annexure [IVX]+)'
-        ]
-        
-        citations = []
-        for pattern in citation_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            citations.extend(matches)
-        
-        return list(set(citations))
+        return list({match for pattern in _CITATION_PATTERNS for match in pattern.findall(text)})
     
     def _extract_regulatory_refs(self, text: str) -> List[str]:
         """
         Extract regulatory references from the response
         """
-        import re
-        
-        reg_patterns = [
-            r'(CPCB.*?2016)',
-            r'(Solid Waste Management Rules.*?2016)',
-            r'(Hazardous and Other Wastes Rules.*?2016)',
-            r'(Bio-medical Waste Management Rules.*?2016)',
-            r'(E-Waste Management Rules.*?2016)',
-            r'(Environment Protection Act.*?1986)'
-        ]
-        
-        refs = []
-        for pattern in reg_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            refs.extend(matches)
-        
-        return list(set(refs))
+        return list({match for pattern in _REGULATORY_PATTERNS for match in pattern.findall(text)})
     
     def _extract_mandatory_steps(self, text: str) -> List[str]:
         """
         Extract mandatory steps from the response
         """
-        import re
-        
-        # Look for imperative language indicating required steps
-        step_patterns = [
-            r'(must.*?)(?:\.|\n)',
-            r'(shall.*?)(?:\.|\n)', 
-            r'(required to.*?)(?:\.|\n)',
-            r'(need to.*?)(?:\.|\n)',
-            r'(procedure.*?)(?:\.|\n)'
-        ]
-        
-        steps = []
-        for pattern in step_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            steps.extend([step.strip() for step in matches])
-        
-        return list(set(steps))
+        return list({match.strip() for pattern in _MANDATORY_STEP_PATTERNS for match in pattern.findall(text)})
     
     def _extract_authorized_entities(self, text: str) -> List[str]:
         """
         Extract references to authorized entities from the response
         """
-        import re
-        
-        entity_patterns = [
-            r'(authorized.*?handler)',
-            r'(certified.*?facility)', 
-            r'(licensed.*?operator)',
-            r'(government approved.*?entity)',
-            r'(CPCB authorized)',
-            r'(State PCB recognized)'
-        ]
-        
-        entities = []
-        for pattern in entity_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities.extend(matches)
-        
-        return list(set(entities))
+        return list({match for pattern in _AUTHORIZED_ENTITY_PATTERNS for match in pattern.findall(text)})
     
     def _extract_collection_targets(self, text: str) -> List[str]:
         """
         Extract collection targets for EPR
         """
-        import re
-        
-        target_patterns = [
-            r'(\d+%\s*(?:of|for|collection))',
-            r'(\d+\s*(?:tons|tonnes|kg)\s*(?:per|target))',
-            r'(collection target.*?\d+%)',
-            r'((?:minimum|maximum)\s*\d+%\s*(?:collection|recovery))'
-        ]
-        
-        targets = []
-        for pattern in target_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            targets.extend(matches)
-        
-        return list(set(targets))
+        return list({match for pattern in _COLLECTION_TARGET_PATTERNS for match in pattern.findall(text)})
     
     def _extract_reporting_reqs(self, text: str) -> List[str]:
         """
         Extract reporting requirements
         """
-        import re
-        
-        report_patterns = [
-            r'(report.*?(?:quarterly|annual|monthly|yearly))',
-            r'(submit.*?report)',
-            r'(documentation.*?requirement)',
-            r'(record keeping.*?)(?:\.|\n)'
-        ]
-        
-        reports = []
-        for pattern in report_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            reports.extend([rep.strip() for rep in matches])
-        
-        return list(set(reports))
+        return list({match.strip() for pattern in _REPORTING_PATTERNS for match in pattern.findall(text)})
     
     def _extract_penalty_info(self, text: str) -> List[str]:
         """
         Extract penalty-related information
         """
-        import re
-        
-        penalty_patterns = [
-            r'(penalty.*?\d+)',
-            r'(fine.*?Rs)',
-            r'(imprisonment|jail|custody)',
-            r'(Section \d+.*?penalty)'
-        ]
-        
-        penalties = []
-        for pattern in penalty_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            penalties.extend(matches)
-        
-        return list(set(penalties))
+        return list({match for pattern in _PENALTY_PATTERNS for match in pattern.findall(text)})
 
 # Example usage and testing
 def test_legal_rag():
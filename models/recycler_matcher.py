@@ -1,9 +1,78 @@
 import json
 import math
+import re
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from geopy.distance import geodesic
+import numpy as np
 import os
 
+try:
+    # Exact WGS84 geodesic distances in C
+    from pyproj import Geod
+    _GEOD = Geod(ellps='WGS84')
+except ImportError:
+    _GEOD = None
+
+EARTH_RADIUS_KM = 6371.0
+# Below this many recyclers a vectorized pass over all of them beats building a KD-tree
+KDTREE_MIN_RECYCLERS = 256
+# First number in a capacity string like "15 tons/day"
+_CAPACITY_RE = re.compile(r'(\d+)')
+_HAZARDOUS_QUERIES = frozenset({'HAZARDOUS', 'CHEMICAL', 'MEDICAL', 'BATTERY'})
+_HAZARD_SET = frozenset({'HAZARDOUS', 'CHEMICAL', 'MEDICAL', 'BATTERIES', 'E-WASTE'})
+_CATEGORY_MATERIALS = {
+    'plastic': frozenset({'PET', 'HDPE', 'LDPE', 'PP', 'PS', 'PVC', 'PLASTIC'}),
+    'metal': frozenset({'METAL', 'STEEL', 'ALUMINIUM', 'IRON'}),
+    'paper': frozenset({'PAPER', 'CARDBOARD', 'NEWSPAPER', 'MAGAZINE'}),
+    'hazardous': frozenset({'HAZARDOUS', 'CHEMICAL', 'MEDICAL', 'BATTERY', 'PESTICIDE'}),
+    'electronic': frozenset({'ELECTRONICS', 'E-WASTE', 'COMPUTER', 'PHONE', 'CIRCUIT'})
+}
+
+
+@lru_cache(maxsize=4)
+def _load_recyclers(recyclers_file_path: str) -> List[Dict]:
+    """
+    Load recycler data, trying the given path and then the usual data/ locations
+    """
+    # Handle different possible file paths
+    possible_paths = [
+        recyclers_file_path,
+        os.path.join(os.path.dirname(__file__), "..", "data", "recyclers.json"),
+        os.path.join(os.path.dirname(__file__), "data", "recyclers.json"),
+        os.path.join(os.getcwd(), "data", "recyclers.json"),
+        "data/recyclers.json"
+    ]
+    
+    for path in possible_paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                recyclers = json.load(f)
+                print(f"Loaded recyclers data from: {path}")
+                return recyclers
+        except FileNotFoundError:
+            continue
+        except json.JSONDecodeError:
+            print(f"Could not parse JSON from {path}")
+            continue
+    
+    print("Warning: Could not load recyclers data. Using empty list.")
+    return []
+
+
+def _parse_capacity(capacity_str) -> int:
+    match = _CAPACITY_RE.search(str(capacity_str))
+    return int(match.group(1)) if match else 0
+
+
+def _build_tree(lats: np.ndarray, lons: np.ndarray, cos_lats: np.ndarray):
+    # scipy is only imported for datasets large enough to use the tree
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree(np.column_stack((cos_lats * np.cos(lons), cos_lats * np.sin(lons), np.sin(lats))))
+
+
 class RecyclerMatcher:
     """
     Matches waste materials with nearby recyclers based on location and material compatibility
@@ -16,30 +85,40 @@ class RecyclerMatcher:
         Args:
             recyclers_file_path: Path to JSON file containing recycler information
         """
-        # Handle different possible file paths
-        possible_paths = [
-            recyclers_file_path,
-            os.path.join(os.path.dirname(__file__), "..", "data", "recyclers.json"),
-            os.path.join(os.path.dirname(__file__), "data", "recyclers.json"),
-            os.path.join(os.getcwd(), "data", "recyclers.json"),
-            "data/recyclers.json"
-        ]
-        
-        self.recyclers = []
-        for path in possible_paths:
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    self.recyclers = json.load(f)
-                    print(f"Loaded recyclers data from: {path}")
-                    break
-            except FileNotFoundError:
-                continue
-            except json.JSONDecodeError:
-                print(f"Could not parse JSON from {path}")
-                continue
-        
-        if not self.recyclers:
-            print("Warning: Could not load recyclers data. Using empty list.")
+        # Parsed once per process; later instances share the list
+        self.recyclers = _load_recyclers(recyclers_file_path)
+
+        # Coordinates as arrays so distances to every recycler are one vectorized pass
+        self._lats = np.radians(np.array([r['location']['latitude'] for r in self.recyclers], dtype=np.float64))
+        self._lons = np.radians(np.array([r['location']['longitude'] for r in self.recyclers], dtype=np.float64))
+        self._cos_lats = np.cos(self._lats)
+        # KD-tree over unit-sphere xyz: chord length grows monotonically with great-circle
+        # distance, so a radius query returns exactly the recyclers within range
+        self._tree = None
+        if len(self.recyclers) >= KDTREE_MIN_RECYCLERS:
+            self._tree = _build_tree(self._lats, self._lons, self._cos_lats)
+        # Uppercased materials per recycler, computed once: ordered for display, set for lookups
+        self._materials_upper = [tuple(mat.upper() for mat in r.get('materials', [])) for r in self.recyclers]
+        self._materials_sets = [frozenset(materials) for materials in self._materials_upper]
+        self._capacity_by_id = {r.get('id'): _parse_capacity(r.get('capacity', '0')) for r in self.recyclers}
+        # Struct-of-arrays material table: column per distinct material, row per recycler,
+        # so material filters are boolean column ops combined with the distance mask
+        self._material_columns = {
+            mat: column for column, mat in enumerate(sorted(set().union(*self._materials_sets)))
+        }
+        self._accepts = np.zeros((len(self.recyclers), len(self._material_columns)), dtype=bool)
+        for index, materials in enumerate(self._materials_sets):
+            self._accepts[index, [self._material_columns[mat] for mat in materials]] = True
+        self._is_hazard_handler = self._accepts_any(_HAZARD_SET)
+        # Recyclers listing HAZARDOUS or CHEMICAL match every query in find_nearby_recyclers
+        self._is_general_hazard = self._accepts_any(('HAZARDOUS', 'CHEMICAL'))
+    
+    def _accepts_any(self, materials) -> np.ndarray:
+        """
+        Boolean mask of recyclers accepting at least one of the given (uppercased) materials
+        """
+        columns = [self._material_columns[mat] for mat in materials if mat in self._material_columns]
+        return self._accepts[:, columns].any(axis=1)
     
     def calculate_distance(self, point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
         """
@@ -52,7 +131,58 @@ class RecyclerMatcher:
         Returns:
             Distance in kilometers
         """
-        return geodesic(point1, point2).kilometers
+        if _GEOD is not None:
+            _, _, meters = _GEOD.inv(point1[1], point1[0], point2[1], point2[0])
+            return meters / 1000.0
+        
+        # Haversine fallback
+        lat1, lat2 = math.radians(point1[0]), math.radians(point2[0])
+        dlat = lat2 - lat1
+        dlon = math.radians(point2[1] - point1[1])
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+    def _haversine_vec(self, lat0: float, lon0: float, indices: np.ndarray = None) -> np.ndarray:
+        """
+        Great-circle distance in kilometers from (lat0, lon0) to every recycler, or to the given indices
+        """
+        lats, lons, cos_lats = self._lats, self._lons, self._cos_lats
+        if indices is not None:
+            lats, lons, cos_lats = lats[indices], lons[indices], cos_lats[indices]
+        lat0 = math.radians(lat0)
+        lon0 = math.radians(lon0)
+        a = np.sin((lats - lat0) / 2) ** 2 + math.cos(lat0) * cos_lats * np.sin((lons - lon0) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    def _distances_within(self, user_location: Tuple[float, float], max_distance: float) -> np.ndarray:
+        """
+        Distance in kilometers to each recycler within max_distance, inf for the rest
+        """
+        lat0, lon0 = user_location
+        if self._tree is None:
+            distances = self._haversine_vec(lat0, lon0)
+        else:
+            lat, lon = math.radians(lat0), math.radians(lon0)
+            point = (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+            chord = 2 * math.sin(min(max(max_distance, 0.0) / EARTH_RADIUS_KM, math.pi) / 2)
+            # Small slack for float rounding; the exact cutoff is applied below
+            indices = np.asarray(self._tree.query_ball_point(point, chord * (1 + 1e-9)), dtype=np.intp)
+            distances = np.full(len(self.recyclers), np.inf)
+            distances[indices] = self._haversine_vec(lat0, lon0, indices)
+        distances[distances > max_distance] = np.inf
+        return distances
+
+    def _top_k(self, indices: List[int], distances: np.ndarray, k: int) -> List[int]:
+        """
+        The k indices with the smallest distance, nearest first
+        """
+        if k <= 0 or len(indices) == 0:
+            return []
+        indices = np.asarray(indices)
+        if len(indices) > k:
+            # Partial selection: no need to fully sort the candidates we drop
+            indices = indices[np.argpartition(distances[indices], k - 1)[:k]]
+        return indices[np.argsort(distances[indices], kind='stable')].tolist()
     
     def find_nearby_recyclers(self, 
                              user_location: Tuple[float, float], 
@@ -77,61 +207,36 @@ class RecyclerMatcher:
         # Normalize material type
         material_type = material_type.upper().strip()
         
-        # Filter recyclers that accept the material and are within distance
-        matching_recyclers = []
+        # Only recyclers within range are checked further
+        distances = self._distances_within(user_location, max_distance)
+        in_range = distances <= max_distance
         
-        for recycler in self.recyclers:
-            # Check if recycler accepts this material
-            materials_accepted = [mat.upper() for mat in recycler.get('materials', [])]
-            
-            # For hazardous materials, look for recyclers that handle hazardous materials
-            if material_type in ['HAZARDOUS', 'CHEMICAL', 'MEDICAL', 'BATTERY'] or \
-               'HAZARDOUS' in materials_accepted or 'CHEMICAL' in materials_accepted:
-                # These recyclers handle hazardous materials
-                if any(hazard in materials_accepted for hazard in ['HAZARDOUS', 'CHEMICAL', 'MEDICAL', 'BATTERIES', 'E-WASTE']):
-                    recycler_location = (
-                        recycler['location']['latitude'], 
-                        recycler['location']['longitude']
-                    )
-                    distance = self.calculate_distance(user_location, recycler_location)
-                    
-                    if distance <= max_distance:
-                        recycler_copy = recycler.copy()
-                        recycler_copy['distance'] = round(distance, 2)
-                        
-                        # Set appropriate rate for hazardous materials
-                        if 'rates' in recycler and material_type in recycler['rates']:
-                            recycler_copy['rate'] = recycler['rates'][material_type]
-                        else:
-                            recycler_copy['rate'] = 'Varies by material'
-                            
-                        matching_recyclers.append(recycler_copy)
-            
-            # For regular materials, check if it's in accepted materials
-            elif material_type in materials_accepted:
-                recycler_location = (
-                    recycler['location']['latitude'], 
-                    recycler['location']['longitude']
-                )
-                distance = self.calculate_distance(user_location, recycler_location)
-                
-                if distance <= max_distance:
-                    recycler_copy = recycler.copy()
-                    recycler_copy['distance'] = round(distance, 2)
-                    
-                    # Set the rate for this specific material
-                    if 'rates' in recycler and material_type in recycler['rates']:
-                        recycler_copy['rate'] = recycler['rates'][material_type]
-                    else:
-                        recycler_copy['rate'] = 'Rate available on inquiry'
-                        
-                    matching_recyclers.append(recycler_copy)
+        # For hazardous materials, look for recyclers that handle hazardous materials
+        if material_type in _HAZARDOUS_QUERIES:
+            fallback_rates = dict.fromkeys(
+                np.flatnonzero(self._is_hazard_handler & in_range).tolist(), 'Varies by material'
+            )
+        # For regular materials, recyclers that accept it (general hazardous handlers always qualify)
+        else:
+            mask = (self._accepts_any((material_type,)) | self._is_general_hazard) & in_range
+            fallback_rates = {
+                index: 'Varies by material' if self._is_general_hazard[index] else 'Rate available on inquiry'
+                for index in np.flatnonzero(mask).tolist()
+            }
         
-        # Sort by distance
-        matching_recyclers.sort(key=lambda x: x['distance'])
+        # Top N by distance; only these few get a result dict built
+        matching_recyclers = []
+        for index in self._top_k(list(fallback_rates), distances, max_results):
+            recycler = self.recyclers[index]
+            # Rate for this specific material, else the fallback
+            rate = recycler.get('rates', {}).get(material_type, fallback_rates[index])
+            matching_recyclers.append({
+                **recycler,
+                'distance': round(float(distances[index]), 2),
+                'rate': rate
+            })
         
-        # Return top N results
-        return matching_recyclers[:max_results]
+        return matching_recyclers
     
     def get_best_recycler_by_criteria(self, 
                                    user_location: Tuple[float, float],
@@ -159,15 +264,9 @@ class RecyclerMatcher:
                          x.get('rate', 0) if isinstance(x.get('rate'), (int, float)) else 0, 
                          reverse=True)
         elif criteria == 'capacity':
-            # Sort by capacity (parse capacity string to get numeric value)
-            def extract_capacity(capacity_str):
-                import re
-                # Extract number from string like "15 tons/day"
-                match = re.search(r'(\d+)', str(capacity_str))
-                return int(match.group(1)) if match else 0
-            
+            # Sort by capacity (parsed once at load)
             return sorted(nearby_recyclers, 
-                         key=lambda x: extract_capacity(x.get('capacity', '0')),
+                         key=lambda x: self._capacity_by_id.get(x.get('id'), 0),
                          reverse=True)
         else:
             return nearby_recyclers
@@ -185,44 +284,25 @@ class RecyclerMatcher:
         Returns:
             List of recyclers that handle the category
         """
-        category_mappings = {
-            'plastic': ['PET', 'HDPE', 'LDPE', 'PP', 'PS', 'PVC', 'PLASTIC'],
-            'metal': ['METAL', 'STEEL', 'ALUMINIUM', 'IRON'],
-            'paper': ['PAPER', 'CARDBOARD', 'NEWSPAPER', 'MAGAZINE'],
-            'hazardous': ['HAZARDOUS', 'CHEMICAL', 'MEDICAL', 'BATTERY', 'PESTICIDE'],
-            'electronic': ['ELECTRONICS', 'E-WASTE', 'COMPUTER', 'PHONE', 'CIRCUIT']
-        }
-        
-        if material_category.lower() not in category_mappings:
+        materials_in_category = _CATEGORY_MATERIALS.get(material_category.lower())
+        if materials_in_category is None:
             return []
         
-        materials_in_category = category_mappings[material_category.lower()]
+        # Find recyclers within 20km that accept any material in this category
+        distances = self._distances_within(user_location, 20.0)
+        mask = self._accepts_any(materials_in_category) & (distances <= 20.0)
         
-        # Find recyclers that accept any material in this category
+        # Top 5 by distance; the matched materials are only listed for these
         matching_recyclers = []
-        for recycler in self.recyclers:
-            recycler_materials = [mat.upper() for mat in recycler.get('materials', [])]
-            
-            # Check if there's any overlap between materials
-            if any(mat in recycler_materials for mat in materials_in_category):
-                recycler_location = (
-                    recycler['location']['latitude'], 
-                    recycler['location']['longitude']
-                )
-                distance = self.calculate_distance(user_location, recycler_location)
-                
-                if distance <= 20.0:  # Within 20km
-                    recycler_copy = recycler.copy()
-                    recycler_copy['distance'] = round(distance, 2)
-                    recycler_copy['materials_match'] = [
-                        mat for mat in recycler_materials 
-                        if mat in materials_in_category
-                    ]
-                    matching_recyclers.append(recycler_copy)
+        for index in self._top_k(np.flatnonzero(mask), distances, 5):
+            matching_recyclers.append({
+                **self.recyclers[index],
+                'distance': round(float(distances[index]), 2),
+                # Recycler's own order, uppercased once at load
+                'materials_match': [mat for mat in self._materials_upper[index] if mat in materials_in_category]
+            })
         
-        # Sort by distance
-        matching_recyclers.sort(key=lambda x: x['distance'])
-        return matching_recyclers[:5]  # Return top 5
+        return matching_recyclers
     
     def get_recycler_details(self, recycler_id: str) -> Dict:
         """
@@ -1,7 +1,53 @@
 import re
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
 from typing import Dict, List, Tuple
 from .vision_processor import WasteVisionAnalyzer
 
+# Descriptions shorter than this are matched word-by-word instead of via the regex
+SHORT_TEXT_LENGTH = 64
+
+# Safety guideline blocks, combined per hazard category
+_GL_SAFE = (
+    "Material appears safe for standard recycling procedures",
+    "Follow general waste segregation guidelines",
+    "Handle with regular protective equipment"
+)
+_GL_CHEM = (
+    "⚠️ CHEMICAL HAZARD DETECTED",
+    "Use chemical-resistant gloves and eye protection",
+    "Ensure adequate ventilation in handling area",
+    "Contact certified hazardous waste disposal facility",
+    "Do not mix with regular recyclables"
+)
+_GL_MEDICAL = (
+    "⚠️ BIOHAZARD/MEDICAL WASTE DETECTED",
+    "Use puncture-resistant gloves and face protection",
+    "Segregate immediately in leak-proof container",
+    "Contact medical waste disposal specialist",
+    "Follow CPCB biomedical waste handling protocols"
+)
+_GL_ELECTRONICS = (
+    "⚠️ ELECTRONIC WASTE DETECTED",
+    "Contains potentially toxic materials (lead, mercury, etc.)",
+    "Contact authorized e-waste recycling facility",
+    "Do not attempt to dismantle components",
+    "Follow E-Waste (Management) Rules, 2016"
+)
+_GL_SHARP = (
+    "⚠️ SHARP OBJECTS DETECTED",
+    "Use cut-resistant gloves",
+    "Handle with extreme care to prevent injury",
+    "Place in puncture-proof container",
+    "Label appropriately for safe handling"
+)
+_GL_GENERAL = (
+    "Report to local CPCB authority if required",
+    "Maintain proper documentation for disposal",
+    "Ensure handler is trained in hazardous material safety"
+)
+
 class SafetyAgent:
     """
     Safety agent that checks if materials are hazardous based on analysis
@@ -31,11 +77,21 @@ class SafetyAgent:
             ]
         }
         
-        # Compile regex patterns for efficient matching
-        self.compiled_patterns = {}
+        # One combined pattern scans the text once; each matched keyword maps back to
+        # every category listing it (e.g. 'battery' is both chemicals and electronics)
+        keyword_categories = {}
         for category, keywords in self.hazardous_keywords.items():
-            pattern = r'\b(' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b'
-            self.compiled_patterns[category] = re.compile(pattern, re.IGNORECASE)
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword.lower(), []).append(category)
+        # Read-only, so a caller can't corrupt the lookup shared by every assessment
+        self.keyword_categories = MappingProxyType({
+            keyword: tuple(categories) for keyword, categories in keyword_categories.items()
+        })
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(self.keyword_categories, key=len, reverse=True))
+        self.hazard_pattern = re.compile(r'\b(' + alternation + r')\b', re.IGNORECASE)
+        
+        # Identical analyses (same text and vision hazard count) reuse the assessment
+        self._assess_cached = lru_cache(maxsize=256)(self._assess)
     
     def check_hazardous_material(self, material_analysis: Dict) -> Dict:
         """
@@ -51,108 +107,100 @@ class SafetyAgent:
         description = material_analysis.get('description', '').lower()
         material_category = material_analysis.get('material_category', '').lower()
         
-        # Initialize safety assessment
-        safety_assessment = {
-            'is_hazardous': False,
-            'risk_level': 'low',  # low, medium, high
-            'hazard_categories': [],
-            'safety_guidelines': [],
-            'confidence': material_analysis.get('confidence_score', 0)
-        }
-        
         # Check for hazardous indicators in various fields
         all_text = f"{material_type} {description} {material_category}".lower()
         
-        detected_hazards = []
+        # Also count the hazardous_indicators from the vision analysis
+        vision_hazards = material_analysis.get('hazardous_indicators', [])
+        vision_hazard_count = len(vision_hazards) if vision_hazards else 0
         
-        # Check each category of hazardous keywords
-        for category, pattern in self.compiled_patterns.items():
-            matches = pattern.findall(all_text)
-            if matches:
-                detected_hazards.extend([category] * len(matches))
+        is_hazardous, risk_level, hazard_categories, guidelines = self._assess_cached(
+            all_text, vision_hazard_count
+        )
         
-        # Also check the hazardous_indicators from the vision analysis
-        vision_hazards = material_analysis.get('hazardous_indicators', [])
-        if vision_hazards:
-            detected_hazards.extend(['vision_detected'] * len(vision_hazards))
+        # Fresh lists per call so callers can't mutate the cached assessment
+        return {
+            'is_hazardous': is_hazardous,
+            'risk_level': risk_level,  # low, medium, high
+            'hazard_categories': list(hazard_categories),
+            'safety_guidelines': list(guidelines),
+            'confidence': material_analysis.get('confidence_score', 0)
+        }
+    
+    def _assess(self, all_text: str, vision_hazard_count: int) -> Tuple[bool, str, Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Hazard assessment for the combined analysis text, cached per instance in __init__
+        """
+        # Only the number of hits and the distinct categories matter
+        hit_count = vision_hazard_count
+        hit_cats = {'vision_detected'} if vision_hazard_count else set()
+        
+        # Check all categories of hazardous keywords in a single pass
+        compact = all_text.replace(' ', '')
+        if len(all_text) < SHORT_TEXT_LENGTH and compact.isalnum():
+            # Plain words separated by single spaces: dictionary lookups on each word and
+            # each adjacent pair ('circuit board') give the same matches as the regex
+            words = all_text.split(' ')
+            matches = words + [f"{word} {following}" for word, following in zip(words, words[1:])]
+        elif compact:
+            matches = [match.lower() for match in self.hazard_pattern.findall(all_text)]
+        else:
+            matches = []
+        
+        for match in matches:
+            categories = self.keyword_categories.get(match)
+            if categories:
+                hit_cats.update(categories)
+                hit_count += len(categories)
+        
+        is_hazardous = False
+        risk_level = 'low'
+        hazard_categories = ()
         
         # Determine if material is hazardous
-        if detected_hazards:
-            safety_assessment['is_hazardous'] = True
+        if hit_count:
+            is_hazardous = True
             
             # Determine risk level based on number and type of hazards
-            if len(detected_hazards) >= 3:
-                safety_assessment['risk_level'] = 'high'
-            elif len(detected_hazards) >= 1:
-                safety_assessment['risk_level'] = 'medium'
+            if hit_count >= 3:
+                risk_level = 'high'
+            else:
+                risk_level = 'medium'
             
-            safety_assessment['hazard_categories'] = list(set(detected_hazards))
+            hazard_categories = tuple(hit_cats)
         
         # Generate safety guidelines based on hazard type
-        safety_assessment['safety_guidelines'] = self._generate_safety_guidelines(
-            safety_assessment['is_hazardous'],
-            safety_assessment['hazard_categories']
-        )
+        guidelines = self._generate_safety_guidelines(is_hazardous, tuple(sorted(hazard_categories)))
         
-        return safety_assessment
+        return is_hazardous, risk_level, hazard_categories, guidelines
     
-    def _generate_safety_guidelines(self, is_hazardous: bool, hazard_categories: List[str]) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _generate_safety_guidelines(is_hazardous: bool, hazard_categories: Tuple[str, ...]) -> Tuple[str, ...]:
         """
         Generate appropriate safety guidelines based on hazard assessment
         """
-        guidelines = []
+        parts = []
         
         if not is_hazardous:
-            guidelines.extend([
-                "Material appears safe for standard recycling procedures",
-                "Follow general waste segregation guidelines",
-                "Handle with regular protective equipment"
-            ])
+            parts.append(_GL_SAFE)
         else:
             if 'chemicals' in hazard_categories or 'vision_detected' in hazard_categories:
-                guidelines.extend([
-                    "⚠️ CHEMICAL HAZARD DETECTED",
-                    "Use chemical-resistant gloves and eye protection",
-                    "Ensure adequate ventilation in handling area",
-                    "Contact certified hazardous waste disposal facility",
-                    "Do not mix with regular recyclables"
-                ])
+                parts.append(_GL_CHEM)
             
             if 'medical' in hazard_categories:
-                guidelines.extend([
-                    "⚠️ BIOHAZARD/MEDICAL WASTE DETECTED",
-                    "Use puncture-resistant gloves and face protection",
-                    "Segregate immediately in leak-proof container",
-                    "Contact medical waste disposal specialist",
-                    "Follow CPCB biomedical waste handling protocols"
-                ])
+                parts.append(_GL_MEDICAL)
             
             if 'electronics' in hazard_categories:
-                guidelines.extend([
-                    "⚠️ ELECTRONIC WASTE DETECTED",
-                    "Contains potentially toxic materials (lead, mercury, etc.)",
-                    "Contact authorized e-waste recycling facility",
-                    "Do not attempt to dismantle components",
-                    "Follow E-Waste (Management) Rules, 2016"
-                ])
+                parts.append(_GL_ELECTRONICS)
             
             if 'sharp_objects' in hazard_categories:
-                guidelines.extend([
-                    "⚠️ SHARP OBJECTS DETECTED",
-                    "Use cut-resistant gloves",
-                    "Handle with extreme care to prevent injury",
-                    "Place in puncture-proof container",
-                    "Label appropriately for safe handling"
-                ])
+                parts.append(_GL_SHARP)
             
             # General hazardous waste guidelines
-            guidelines.extend([
-                "Report to local CPCB authority if required",
-                "Maintain proper documentation for disposal",
-                "Ensure handler is trained in hazardous material safety"
-            ])
+            parts.append(_GL_GENERAL)
         
-        return guidelines
+        return tuple(chain.from_iterable(parts))
     
     def get_regulatory_compliance_info(self, hazard_categories: List[str]) -> Dict:
         """
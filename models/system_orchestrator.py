@@ -1,11 +1,16 @@
-﻿from typing import Dict, Any, Optional
+﻿from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 
-from models.vision_processor import WasteVisionAnalyzer
+from models.vision_processor import get_analyzer
 from models.safety_guard import SafetyAgent
 from models.legal_rag import LegalComplianceRAG
 from models.instruction_generator import InstructionGenerator
 from utils.recycler_matcher import match_recyclers
 
+# match_recyclers always sets both keys
+_NAME_AND_DISTANCE = itemgetter("name", "distance")
+
 
 class CircularAISystem:
     """
@@ -14,7 +19,7 @@ class CircularAISystem:
     """
 
     def __init__(self):
-        self.vision = WasteVisionAnalyzer()
+        self.vision = get_analyzer()
         self.safety = SafetyAgent()
         self.legal = LegalComplianceRAG()
         self.instruction_gen = InstructionGenerator()
@@ -35,33 +40,106 @@ class CircularAISystem:
 
         safety_assessment = self.safety.check_hazardous_material(material_analysis)
 
-        compliance_info = self.legal.get_disposal_guidelines(
-            material_analysis.get("material_type", "unknown")
-        )
+        # Recycler matching only needs vision + safety output, so it runs alongside
+        # the compliance lookup and instruction generation (both network-bound)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            recyclers_future = executor.submit(
+                match_recyclers,
+                material_analysis.get("material_type", ""),
+                city=city,
+                user_lat=user_lat,
+                user_lon=user_lon,
+                hazardous=safety_assessment.get("is_hazardous", False),
+                limit=3
+            )
 
-        instruction_payload = self.instruction_gen.generate(
-            material_analysis,
-            safety_assessment,
-            compliance_info,
-            city=city
-        )
+            compliance_info = self.legal.get_disposal_guidelines(
+                material_analysis.get("material_type", "unknown")
+            )
+
+            instruction_payload = self.instruction_gen.generate(
+                material_analysis,
+                safety_assessment,
+                compliance_info,
+                city=city
+            )
+
+            recyclers = recyclers_future.result()
 
-        recyclers = match_recyclers(
-            material_analysis.get("material_type", ""),
-            city=city,
-            user_lat=user_lat,
-            user_lon=user_lon,
-            hazardous=safety_assessment.get("is_hazardous", False),
-            limit=3
+        return self._build_result(
+            material_analysis, safety_assessment, compliance_info, instruction_payload, recyclers
         )
 
-        local_rules = []
-        citations = compliance_info.get("citations", [])
-        sources = compliance_info.get("sources", [])
-        for c in citations:
-            local_rules.append({"rule": c, "source": "CPCB 2016"})
-        for s in sources:
-            local_rules.append({"rule": "Source document", "source": s})
+    def run_batch(
+        self,
+        images: List[bytes],
+        filenames: Optional[List[Optional[str]]] = None,
+        city: Optional[str] = None,
+        user_lat: Optional[float] = None,
+        user_lon: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the pipeline over several images from the same user/location.
+        Compliance lookups and recycler matching are done once per distinct
+        material (and hazard flag) in the batch rather than once per image.
+        """
+        filenames = filenames or [None] * len(images)
+        material_analyses = [
+            self.vision.analyze_waste_image(image_bytes, image_format="bytes", filename=filename)
+            for image_bytes, filename in zip(images, filenames)
+        ]
+        safety_assessments = [self.safety.check_hazardous_material(m) for m in material_analyses]
+
+        compliance_by_material: Dict[str, Dict[str, Any]] = {}
+        recyclers_by_key: Dict[Tuple[str, bool], List[Dict]] = {}
+        results = []
+        for material_analysis, safety_assessment in zip(material_analyses, safety_assessments):
+            material_type = material_analysis.get("material_type", "unknown")
+            if material_type not in compliance_by_material:
+                compliance_by_material[material_type] = self.legal.get_disposal_guidelines(material_type)
+            compliance_info = compliance_by_material[material_type]
+
+            instruction_payload = self.instruction_gen.generate(
+                material_analysis,
+                safety_assessment,
+                compliance_info,
+                city=city
+            )
+
+            key = (material_analysis.get("material_type", ""), safety_assessment.get("is_hazardous", False))
+            if key not in recyclers_by_key:
+                recyclers_by_key[key] = match_recyclers(
+                    key[0],
+                    city=city,
+                    user_lat=user_lat,
+                    user_lon=user_lon,
+                    hazardous=key[1],
+                    limit=3
+                )
+
+            results.append(self._build_result(
+                material_analysis,
+                safety_assessment,
+                dict(compliance_info),
+                instruction_payload,
+                list(recyclers_by_key[key])
+            ))
+
+        return results
+
+    def _build_result(
+        self,
+        material_analysis: Dict[str, Any],
+        safety_assessment: Dict[str, Any],
+        compliance_info: Dict[str, Any],
+        instruction_payload: Dict[str, Any],
+        recyclers: List[Dict]
+    ) -> Dict[str, Any]:
+        local_rules = [
+            {"rule": c, "source": "CPCB 2016"} for c in compliance_info.get("citations", ())
+        ] + [
+            {"rule": "Source document", "source": s} for s in compliance_info.get("sources", ())
+        ]
 
         final_output = {
             "item": material_analysis.get("description") or material_analysis.get("material_type", "Unknown"),
@@ -72,12 +150,8 @@ class CircularAISystem:
             "do_not": instruction_payload.get("do_not", []),
             "local_rules": local_rules,
             "nearby_options": [
-                {
-                    "name": r.get("name"),
-                    "type": "collection_center",
-                    "distance_km": r.get("distance")
-                }
-                for r in recyclers
+                {"name": name, "type": "collection_center", "distance_km": distance}
+                for name, distance in map(_NAME_AND_DISTANCE, recyclers)
             ],
             "nudge": instruction_payload.get("nudge") or material_analysis.get("sustainability_nudge", "")
         }
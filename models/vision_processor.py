@@ -1,18 +1,93 @@
 import io
+import asyncio
 import base64
-from PIL import Image
-from dotenv import load_dotenv
-import os
+import hashlib
+from PIL import Image, ImageOps
 import json
 import re
-from utils.openrouter_config import (
-    get_openrouter_client,
-    get_openrouter_headers,
-    get_openrouter_model_vision,
-    is_strict_genai
-)
+from functools import lru_cache
+from utils.env import env
+from utils.llm_cache import get_llm_cache, make_cache_key
+from utils.retry import retry_with_backoff
+from utils.singleflight import SingleFlight
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Vision models downsample to roughly this size anyway; larger photos only cost upload time
+MAX_UPLOAD_SIDE = 1024
+CACHE_TTL_SECONDS = 86400
+# Below this, the 9x8 thumbnail's gradients are noise (flat or evenly shaded image)
+MIN_GRADIENT_VARIANCE = 4.0
+# Bound in-flight requests in analyze_batch so the OpenRouter rate limit isn't tripped
+MAX_CONCURRENT_REQUESTS = 5
+
+VISION_PROMPT = """
+Analyze this waste image. Return JSON:
+{
+    "material_type": "string",
+    "confidence_score": integer,
+    "hazardous_indicators": ["list"],
+    "recyclability_status": "Recyclable|Non-recyclable|Hazardous",
+    "description": "Technical description",
+    "material_category": "Plastic|Glass|Metal|Paper|Electronic|Chemical|Mixed",
+    "sustainability_nudge": "Impact statement"
+}
+"""
+
+# Outermost {...} in a completion that may wrap the JSON in prose or code fences
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+_inflight = SingleFlight()
+
+
+def _image_fingerprint(raw_bytes) -> str:
+    """
+    64-bit difference hash of an image. Re-uploads of the same photo get the
+    same key, and resized or re-encoded copies usually do too. Flat or evenly
+    shaded images carry no structure for the dHash to see, so different ones
+    would share a key; those fall back to a hash of the exact bytes.
+    """
+    import numpy as np
+
+    image = Image.open(io.BytesIO(raw_bytes))
+    # Only a 9x8 thumbnail is needed, so JPEGs are decoded at a reduced scale
+    image.draft("L", (64, 64))
+    # reducing_gap box-reduces by an integer factor first (Image.reduce) for inputs
+    # draft() can't shrink, e.g. large PNG/WebP.
+    pixels = np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR, reducing_gap=2.0))
+    gradients = np.diff(pixels.astype(np.int16), axis=1)
+    if gradients.var() < MIN_GRADIENT_VARIANCE:
+        return "sha256:" + hashlib.sha256(raw_bytes).hexdigest()
+    return "dhash:" + np.packbits(gradients > 0).tobytes().hex()
+
+
+def _prepare_upload(image, raw_bytes):
+    """
+    Bytes and MIME type to send for an opened (not yet decoded) image.
+    Oversized images are re-encoded as a downscaled JPEG.
+    """
+    if max(image.size) <= MAX_UPLOAD_SIDE:
+        mime_type = "image/jpeg"
+        if image.format:
+            fmt = image.format.lower()
+            if fmt == "png":
+                mime_type = "image/png"
+            elif fmt == "webp":
+                mime_type = "image/webp"
+        return raw_bytes, mime_type
+
+    # For JPEGs, libjpeg decodes straight at a reduced DCT scale instead of full resolution
+    image.draft("RGB", (MAX_UPLOAD_SIDE, MAX_UPLOAD_SIDE))
+    # Re-encoding drops EXIF, so apply the camera orientation first
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    image.thumbnail((MAX_UPLOAD_SIDE, MAX_UPLOAD_SIDE), Image.BILINEAR)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue(), "image/jpeg"
 
-load_dotenv()
 
 class WasteVisionAnalyzer:
     """
@@ -21,81 +96,159 @@ class WasteVisionAnalyzer:
     """
     
     def __init__(self):
-        # Initialize OpenRouter
-        api_key = os.getenv("OPENROUTER_API_KEY")
+        # The OpenAI SDK is only imported once an analyzer is actually created
+        from utils.openrouter_config import (
+            get_openrouter_client,
+            get_openrouter_async_client,
+            get_openrouter_headers,
+            get_openrouter_model_vision,
+            is_strict_genai
+        )
+
+        # Initialize OpenRouter; checked once here, so per-call paths can rely on the key
+        api_key = env().get("OPENROUTER_API_KEY")
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables")
 
         self.client = get_openrouter_client()
+        # Async clients are bound to an event loop, so this is resolved per call
+        self._async_client = get_openrouter_async_client
         self.model_name = get_openrouter_model_vision()
         self.headers = get_openrouter_headers()
         self.strict = is_strict_genai()
+        self.cache = get_llm_cache()
 
     def analyze_waste_image(self, image_data, image_format='bytes', filename=None):
         """
         Analyze waste image using GenAI only (no fallback).
+        image_format is 'bytes', 'path' or 'url' (a publicly reachable image URL).
         """
         # 1. Try Real AI (OpenRouter Vision)
         try:
-            # Convert bytes to PIL Image
-            if image_format == 'bytes':
-                image = Image.open(io.BytesIO(image_data))
-                raw_bytes = image_data
-            elif image_format == 'path':
-                image = Image.open(image_data)
-                with open(image_data, "rb") as f:
-                    raw_bytes = f.read()
-            else:
-                raise ValueError("Unsupported image format")
-            
-            # Sanity Check for OpenRouter Key
-            if os.getenv("OPENROUTER_API_KEY"):
-                # Create the prompt 
-                prompt = """
-                Analyze this waste image. Return JSON:
-                {
-                    "material_type": "string",
-                    "confidence_score": integer,
-                    "hazardous_indicators": ["list"],
-                    "recyclability_status": "Recyclable|Non-recyclable|Hazardous",
-                    "description": "Technical description",
-                    "material_category": "Plastic|Glass|Metal|Paper|Electronic|Chemical|Mixed",
-                    "sustainability_nudge": "Impact statement"
-                }
-                """
-                mime_type = "image/jpeg"
-                if image.format:
-                    fmt = image.format.lower()
-                    if fmt == "png":
-                        mime_type = "image/png"
-                    elif fmt == "webp":
-                        mime_type = "image/webp"
-
-                b64 = base64.b64encode(raw_bytes).decode("utf-8")
-                data_url = f"data:{mime_type};base64,{b64}"
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    extra_headers=self.headers,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": prompt},
-                                {"type": "image_url", "image_url": {"url": data_url}}
-                            ]
-                        }
-                    ]
-                )
-                content = response.choices[0].message.content or ""
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group(0))
-                    data["analysis_source"] = "openrouter"
-                    return data
+            request = self._prepare_request(image_data, image_format)
+            if request["cached"] is not None:
+                return request["cached"]
+
+            content = self._complete(VISION_PROMPT, request["image_url"])
+            return self._handle_response(content, request)
+
+        except Exception as e:
+            raise RuntimeError(f"OpenRouter vision failed: {e}")
+
+    async def analyze_waste_image_async(self, image_data, image_format='bytes', filename=None):
+        """
+        Async variant of analyze_waste_image() using the async OpenRouter client.
+        """
+        try:
+            # Decoding/hashing is CPU work; keep it off the event loop
+            request = await asyncio.to_thread(self._prepare_request, image_data, image_format)
+            if request["cached"] is not None:
+                return request["cached"]
+
+            # The same photo submitted twice in one batch makes one provider call
+            return await _inflight.do(request["cache_key"], lambda: self._analyze_uncached(request))
 
         except Exception as e:
             raise RuntimeError(f"OpenRouter vision failed: {e}")
 
+    async def _analyze_uncached(self, request):
+        content = await self._acomplete(VISION_PROMPT, request["image_url"])
+        return self._handle_response(content, request)
+
+    async def analyze_batch(self, items, image_format='bytes', max_concurrency=MAX_CONCURRENT_REQUESTS):
+        """
+        Analyze many images concurrently. Results are returned in input order;
+        failed items are returned as the exception instead of raising.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(image_data):
+            async with semaphore:
+                return await self.analyze_waste_image_async(image_data, image_format)
+
+        return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+
+    def _prepare_request(self, image_data, image_format):
+        # Publicly reachable images are passed by URL: the provider fetches them,
+        # so nothing is downloaded, decoded or base64-encoded here
+        if image_format == 'url':
+            cache_key = make_cache_key({
+                "task": "vision",
+                "model": self.model_name,
+                "prompt": VISION_PROMPT,
+                "url": image_data
+            })
+            return {"cache_key": cache_key, "cached": self.cache.get(cache_key), "image_url": image_data}
+
+        # Read the file once; PIL only parses the header here
+        if image_format == 'bytes':
+            raw_bytes = image_data
+        elif image_format == 'path':
+            with open(image_data, "rb") as f:
+                raw_bytes = f.read()
+        else:
+            raise ValueError("Unsupported image format")
+        image = Image.open(io.BytesIO(raw_bytes))
+
+        # Re-uploads of the same (or a near-identical) photo reuse the earlier analysis
+        cache_key = make_cache_key({
+            "task": "vision",
+            "model": self.model_name,
+            "prompt": VISION_PROMPT,
+            "fingerprint": _image_fingerprint(raw_bytes)
+        })
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return {"cache_key": cache_key, "cached": cached}
+
+        raw_bytes, mime_type = _prepare_upload(image, raw_bytes)
+        # Prefix and payload are joined as bytes so the multi-MB string is only built once
+        data_url = (f"data:{mime_type};base64,".encode("ascii") + base64.b64encode(raw_bytes)).decode("ascii")
+        return {
+            "cache_key": cache_key,
+            "cached": None,
+            "image_url": data_url
+        }
+
+    def _handle_response(self, content, request):
+        json_match = _JSON_RE.search(content or "")
+        if not json_match:
+            return None
+        raw = json_match.group(0)
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        data["analysis_source"] = "openrouter"
+        self.cache.set(request["cache_key"], data, ttl=CACHE_TTL_SECONDS)
+        return data
+
+    def _messages(self, prompt, image_url):
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": image_url}}
+                ]
+            }
+        ]
+
+    @retry_with_backoff()
+    def _complete(self, prompt, image_url):
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            extra_headers=self.headers,
+            messages=self._messages(prompt, image_url)
+        )
+        return response.choices[0].message.content
+
+    @retry_with_backoff()
+    async def _acomplete(self, prompt, image_url):
+        response = await self._async_client().chat.completions.create(
+            model=self.model_name,
+            extra_headers=self.headers,
+            messages=self._messages(prompt, image_url)
+        )
+        return response.choices[0].message.content
+
     def validate_material_type(self, material_type):
         """
         Validate and normalize material types to standard categories
@@ -106,3 +259,11 @@ class WasteVisionAnalyzer:
         }
         normalized = material_type.lower().strip()
         return material_mapping.get(normalized, material_type.upper())
+
+
+@lru_cache(maxsize=1)
+def get_analyzer() -> WasteVisionAnalyzer:
+    """
+    Process-wide analyzer, so clients and config are set up once
+    """
+    return WasteVisionAnalyzer()
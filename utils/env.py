@@ -0,0 +1,15 @@
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def env() -> Mapping[str, str]:
+    """
+    Read-only snapshot of the process environment, with .env loaded once
+    """
+    load_dotenv()
+    return MappingProxyType(dict(os.environ))
@@ -1,14 +1,33 @@
+import json
 import os
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from google import genai
+from utils.env import env
+
+DEFAULT_PREFERRED_MODELS = (
+    "gemini-2.0-flash",
+    "gemini-2.0-flash-001",
+    "gemini-2.5-flash",
+    "gemini-2.5-pro",
+    "gemini-flash-latest",
+    "gemini-pro-latest"
+)
+MODEL_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", ".cache", "gemini_model.json"
+)
+MODEL_CACHE_TTL_SECONDS = 86400
 
 
 def is_strict_genai() -> bool:
-    value = os.getenv("STRICT_GENAI", "1").strip().lower()
+    value = env().get("STRICT_GENAI", "1").strip().lower()
     return value in {"1", "true", "yes", "on"}
 
 
 def get_genai_client():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = env().get("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_API_KEY not found in environment variables")
     return genai.Client(api_key=api_key)
@@ -22,20 +41,49 @@ def _iter_models(model_list):
     return model_list
 
 
-def get_gemini_model_name(preferred=None) -> str:
-    env_model = os.getenv("GEMINI_MODEL", "").strip()
+def _read_cached_model(preferred: Tuple[str, ...]) -> Optional[str]:
+    try:
+        if time.time() - os.path.getmtime(MODEL_CACHE_PATH) > MODEL_CACHE_TTL_SECONDS:
+            return None
+        with open(MODEL_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("preferred") != list(preferred):
+        return None
+    return cached.get("model")
+
+
+def _write_cached_model(preferred: Tuple[str, ...], model: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(MODEL_CACHE_PATH), exist_ok=True)
+        with open(MODEL_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"preferred": list(preferred), "model": model}, f)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=None)
+def get_gemini_model_name(preferred: Optional[Tuple[str, ...]] = None) -> str:
+    """
+    Resolve the Gemini model to use. Listing models is a network round-trip, so the
+    result is kept for the process and on disk for MODEL_CACHE_TTL_SECONDS.
+    """
+    env_model = env().get("GEMINI_MODEL", "").strip()
     if env_model:
         return env_model
 
-    preferred = preferred or [
-        "gemini-2.0-flash",
-        "gemini-2.0-flash-001",
-        "gemini-2.5-flash",
-        "gemini-2.5-pro",
-        "gemini-flash-latest",
-        "gemini-pro-latest"
-    ]
+    preferred = tuple(preferred or DEFAULT_PREFERRED_MODELS)
+    cached = _read_cached_model(preferred)
+    if cached:
+        return cached
+
+    model = _resolve_gemini_model(preferred)
+    _write_cached_model(preferred, model)
+    return model
+
 
+def _resolve_gemini_model(preferred: Tuple[str, ...]) -> str:
     client = get_genai_client()
     try:
         model_list = client.models.list()
@@ -0,0 +1,73 @@
+import asyncio
+import atexit
+import functools
+import threading
+import weakref
+from functools import lru_cache
+
+import httpx
+
+# Keep TCP/TLS connections to OpenRouter/Gemini/Pinecone alive across calls
+_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+_TIMEOUT = httpx.Timeout(30.0)
+# Transport-level retries only cover failed connection attempts (DNS, refused, TLS
+# handshake); HTTP error responses are still retried by utils.retry
+_CONNECT_RETRIES = 2
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def per_event_loop(factory):
+    """
+    Cache factory()'s result per running event loop. Async clients pool
+    connections bound to the loop that opened them, so one process-wide
+    instance breaks as soon as a second loop (e.g. the next asyncio.run) uses it.
+    Instances of loops that have since closed are dropped when a new one is built.
+    Must be called from inside a coroutine.
+    """
+    instances = weakref.WeakKeyDictionary()
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def wrapper():
+        loop = asyncio.get_running_loop()
+        with lock:
+            instance = instances.get(loop)
+            if instance is None:
+                for closed in [other for other in instances if other.is_closed()]:
+                    del instances[closed]
+                instance = instances[loop] = factory()
+        return instance
+
+    def cache_clear():
+        with lock:
+            instances.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Process-wide pooled sync HTTP client
+    """
+    transport = httpx.HTTPTransport(http2=_http2_available(), limits=_LIMITS, retries=_CONNECT_RETRIES)
+    client = httpx.Client(transport=transport, timeout=_TIMEOUT)
+    atexit.register(client.close)
+    return client
+
+
+@per_event_loop
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Pooled async HTTP client for the running event loop
+    """
+    transport = httpx.AsyncHTTPTransport(http2=_http2_available(), limits=_LIMITS, retries=_CONNECT_RETRIES)
+    return httpx.AsyncClient(transport=transport, timeout=_TIMEOUT)
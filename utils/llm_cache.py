@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", ".cache", "llm_cache.sqlite3"
+)
+# Expired exact-tier rows are swept from set() at most this often
+PURGE_INTERVAL_SECONDS = 3600
+# Semantic lookups scan a whole partition, so each one is capped (least recently used goes first)
+SEMANTIC_MAX_ENTRIES_PER_PARTITION = 256
+# Recent query embeddings kept so add_similar() after a miss doesn't embed the same text again
+RECENT_EMBEDDINGS = 64
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Stable hash of the inputs that determine an LLM response
+    """
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+
+def _loads(value: str) -> Any:
+    return orjson.loads(value) if orjson is not None else json.loads(value)
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM responses:
+    - exact tier: SQLite table keyed by a hash of the normalized inputs
+    - semantic tier: in-memory embeddings, returns a stored response when a new
+      query is within `similarity_threshold` cosine similarity of a previous one.
+      Entries expire like exact ones, and each partition holds at most
+      `max_semantic_entries`, evicting the least recently used.
+    The semantic tier is only active when an `embed_fn` is provided.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = SEMANTIC_MAX_ENTRIES_PER_PARTITION
+    ):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._last_purge = 0.0
+
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        # partition -> [(vector, serialized value, expires_at)], oldest use first
+        self._semantic: Dict[str, List[Tuple[Any, str, float]]] = {}
+        self._recent_embeddings: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at < time.time():
+            with self._lock:
+                # Re-check so a row refreshed by a concurrent set() survives
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key = ? AND expires_at < ?", (key, time.time())
+                )
+                self._conn.commit()
+            return None
+        return _loads(value)
+
+    def set(self, key: str, value: Any, ttl: int = 86400) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, _dumps(value), now + ttl)
+            )
+            if now - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                # Rows that are never read again would otherwise stay forever
+                self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+                self._last_purge = now
+            self._conn.commit()
+
+    def get_similar(self, text: str, partition: str = "") -> Optional[Any]:
+        """
+        Return the cached value for the most similar previous query in the same
+        partition, if it clears the similarity threshold.
+        """
+        if not self.embed_fn or not self._semantic.get(partition):
+            return None
+
+        import numpy as np
+
+        query = self._embed(text)
+        with self._lock:
+            entries = self._live_entries(partition)
+            if not entries:
+                return None
+            vectors = np.stack([vec for vec, _, _ in entries])
+            scores = vectors @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None
+            # Mark as most recently used
+            entry = entries.pop(best)
+            entries.append(entry)
+        # Stored serialized, so callers get a fresh copy they are free to mutate
+        return _loads(entry[1])
+
+    def add_similar(self, text: str, value: Any, partition: str = "", ttl: int = 86400) -> None:
+        if not self.embed_fn:
+            return
+        vector = self._embed(text)
+        with self._lock:
+            if partition not in self._semantic:
+                # New partition: sweep the others so expired ones don't pile up
+                for other in list(self._semantic):
+                    self._live_entries(other)
+            entries = self._live_entries(partition)
+            entries.append((vector, _dumps(value), time.time() + ttl))
+            del entries[:-self.max_semantic_entries]
+            self._semantic[partition] = entries
+
+    def _live_entries(self, partition: str) -> List[Tuple[Any, str, float]]:
+        # Drops expired entries (and emptied partitions); caller holds the lock
+        now = time.time()
+        entries = [entry for entry in self._semantic.get(partition, ()) if entry[2] >= now]
+        if entries:
+            self._semantic[partition] = entries
+        else:
+            self._semantic.pop(partition, None)
+        return entries
+
+    def _embed(self, text: str):
+        # A miss is usually followed by add_similar() for the same text, possibly with
+        # other requests interleaved; reuse that embedding
+        with self._lock:
+            vector = self._recent_embeddings.get(text)
+            if vector is not None:
+                self._recent_embeddings.move_to_end(text)
+                return vector
+
+        import numpy as np
+
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        with self._lock:
+            self._recent_embeddings[text] = vector
+            while len(self._recent_embeddings) > RECENT_EMBEDDINGS:
+                self._recent_embeddings.popitem(last=False)
+        return vector
+
+
+@lru_cache(maxsize=None)
+def get_llm_cache(embed_fn: Optional[Callable[[str], List[float]]] = None) -> LLMCache:
+    """
+    Process-wide cache instance, one per embedding function
+    """
+    return LLMCache(embed_fn=embed_fn)
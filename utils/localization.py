@@ -1,227 +1,310 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+_TRANSLATIONS_RAW = {
+    "upload_waste": {
+        "en": "Upload Waste Image",
+        "hi": "कचरा चित्र अपलोड करें"
+    },
+    "hazardous_detected": {
+        "en": "⚠️ HAZARDOUS MATERIAL DETECTED",
+        "hi": "⚠️ खतरनाक सामग्री पाई गई"
+    },
+    "safe_for_recycling": {
+        "en": "✅ SAFE FOR RECYCLING",
+        "hi": "✅ पुनः चक्रण के लिए सुरक्षित"
+    },
+    "processing": {
+        "en": "Processing image...",
+        "hi": "छवि संसोधित की जा रही है..."
+    },
+    "results": {
+        "en": "Analysis Results",
+        "hi": "विश्लेषण परिणाम"
+    },
+    "material_type": {
+        "en": "Material Type",
+        "hi": "सामग्री का प्रकार"
+    },
+    "confidence": {
+        "en": "Confidence",
+        "hi": "आत्मविश्वास"
+    },
+    "analyze_button": {
+        "en": "Analyze Material",
+        "hi": "सामग्री का विश्लेषण करें"
+    },
+    "material_analysis": {
+        "en": "🔬 Material Analysis",
+        "hi": "🔬 सामग्री विश्लेषण"
+    },
+    "safety_guidelines": {
+        "en": "🛡️ Safety Guidelines",
+        "hi": "🛡️ सुरक्षा दिशानिर्देश"
+    },
+    "compliance_info": {
+        "en": "📋 Regulatory Compliance",
+        "hi": "📋 नियामक अनुपालन"
+    },
+    "recycling_options": {
+        "en": "Local Recovery Centers",
+        "hi": "स्थानीय पुनर्प्राप्ति केंद्र"
+    },
+    "welcome_message": {
+        "en": "Upload an image of waste material to begin analysis. Our AI will identify the material type, assess safety, check compliance with CPCB regulations, and connect you with local recyclers.",
+        "hi": "विश्लेषण शुरू करने के लिए कचरा सामग्री की छवि अपलोड करें। हमारा एआई सामग्री के प्रकार की पहचान करेगा, सुरक्षा का मूल्यांकन करेगा, सीपीसीबी नियमों के अनुपालन की जाँच करेगा और आपको स्थानीय पुनर्चक्रण कर्ताओं से जोड़ेगा।"
+    },
+    "about_title": {
+        "en": "About Circular AI",
+        "hi": "सर्कुलर एआई के बारे में"
+    },
+    "about_description": {
+        "en": "Circular AI bridges waste generation and resource recovery using multimodal GenAI.",
+        "hi": "सर्कुलर एआई मल्टीमॉडल जेनएआई का उपयोग करके अपशिष्ट उत्पादन और संसाधन पुनर्प्राप्ति के बीच पुल बनाता है।"
+    },
+    "features_title": {
+        "en": "Features",
+        "hi": "विशेषताएँ"
+    },
+    "multimodal_identification": {
+        "en": "Multimodal waste identification",
+        "hi": "मल्टीमॉडल कचरा पहचान"
+    },
+    "cpcb_compliance": {
+        "en": "CPCB 2016 compliance checking",
+        "hi": "सीपीसीबी 2016 अनुपालन जांच"
+    },
+    "hazardous_detection": {
+        "en": "Hazardous material detection",
+        "hi": "खतरनाक सामग्री का पता लगाना"
+    },
+    "recycler_matching": {
+        "en": "Local recycler price matching",
+        "hi": "स्थानीय पुनर्चक्रण कर्ता मूल्य मिलान"
+    },
+    "language_support": {
+        "en": "Hindi/English interface",
+        "hi": "हिंदी/अंग्रेजी इंटरफेस"
+    },
+    "epr_tracking": {
+        "en": "EPR compliance tracking",
+        "hi": "ईपीआर अनुपालन ट्रैकिंग"
+    },
+    "image_details": {
+        "en": "Image Metadata",
+        "hi": "छवि मेटाडेटा"
+    },
+    "size_label": {
+        "en": "Size:",
+        "hi": "आकार:"
+    },
+    "format_label": {
+        "en": "Format:",
+        "hi": "प्रारूप:"
+    },
+    "mode_label": {
+        "en": "Mode:",
+        "hi": "मोड:"
+    },
+    "settings_title": {
+        "en": "Settings",
+        "hi": "सेटिंग्स"
+    },
+    "api_configured": {
+        "en": "API Keys Configured",
+        "hi": "एपीआई कुंजियाँ कॉन्फ़िगर की गईं"
+    },
+    "configure_api_warning": {
+        "en": "Please configure your API keys in .env file",
+        "hi": "कृपया अपनी एपीआई कुंजियाँ .env फ़ाइल में कॉन्फ़िगर करें"
+    },
+    "contact_recycler": {
+        "en": "Contact Recycler",
+        "hi": "पुनर्चक्रणकर्ता से संपर्क करें"
+    },
+    "contact_request_sent": {
+        "en": "Contact request sent to",
+        "hi": "से संपर्क अनुरोध भेजा गया"
+    },
+    "location_label": {
+        "en": "Location:",
+        "hi": "स्थान:"
+    },
+    "distance_label": {
+        "en": "Distance:",
+        "hi": "दूरी:"
+    },
+    "materials_accepted": {
+        "en": "Materials Accepted:",
+        "hi": "स्वीकृत सामग्री:"
+    },
+    "capacity_label": {
+        "en": "Capacity:",
+        "hi": "क्षमता:"
+    },
+    "contact_label": {
+        "en": "Contact:",
+        "hi": "संपर्क:"
+    },
+    "cpcb_guidelines": {
+        "en": "CPCB Disposal Guidelines:",
+        "hi": "सीपीसीबी निपटान दिशानिर्देश:"
+    },
+    "regulatory_citations": {
+        "en": "Regulatory Citations:",
+        "hi": "नियामक उद्धरण:"
+    },
+    "reference_sources": {
+        "en": "Reference Sources:",
+        "hi": "संदर्भ स्रोत:"
+    },
+    "risk_categories": {
+        "en": "Risk Categories:",
+        "hi": "जोखिम श्रेणियाँ:"
+    },
+    "required_safety_measures": {
+        "en": "Required Safety Measures:",
+        "hi": "आवश्यक सुरक्षा उपाय:"
+    },
+    "standard_procedures": {
+        "en": "Follow standard recycling procedures.",
+        "hi": "मानक पुनर्चक्रण प्रक्रियाओं का पालन करें।"
+    },
+    "protective_equipment": {
+        "en": "Use regular protective equipment.",
+        "hi": "नियमित सुरक्षात्मक उपकरण का उपयोग करें।"
+    },
+    "hazard_warning": {
+        "en": "This material poses potential risks.",
+        "hi": "यह सामग्री संभावित जोखिम पैदा करती है।"
+    },
+    "high_risk_warning": {
+        "en": "⚠️ HIGH RISK - HAZARDOUS MATERIAL DETECTED",
+        "hi": "⚠️ उच्च जोखिम - खतरनाक सामग्री पाई गई"
+    },
+    "medium_risk_warning": {
+        "en": "⚠️ MEDIUM RISK - CAUTION ADVISED",
+        "hi": "⚠️ माध्यम जोखिम - सावधानी की सलाह दी जाती है"
+    },
+    "category_label": {
+        "en": "Category:",
+        "hi": "श्रेणी:"
+    },
+    "description_label": {
+        "en": "Description:",
+        "hi": "विवरण:"
+    },
+    "confidence_score": {
+        "en": "Confidence Score:",
+        "hi": "आत्मविश्वास स्कोर:"
+    },
+    "language_selection": {
+        "en": "Language",
+        "hi": "भाषा"
+    },
+    "english_option": {
+        "en": "English",
+        "hi": "English"
+    },
+    "hindi_option": {
+        "en": "Hindi",
+        "hi": "हिंदी"
+    },
+    "title_en": {
+        "en": "🌍 Circular AI: Waste-to-Resource Navigator",
+        "hi": "🌍 सर्कुलर एआई: कचरा-से-संसाधन नेविगेटर"
+    },
+    "subtitle_en": {
+        "en": "Bridging Waste Generation and Resource Recovery with AI",
+        "hi": "एआई के साथ कचरा उत्पादन और संसाधन पुनर्प्राप्ति के बीच पुल बनाना"
+    },
+    # App labels without a Hindi translation yet; lookups fall back to English
+    "about": {
+        "en": "About Circular AI"
+    },
+    "about_desc": {
+        "en": "**Circular AI** bridges waste generation and resource recovery using multimodal GenAI.\n\n1. Upload an image of waste material\n2. AI identifies material type and properties\n3. Safety assessment determines hazard level\n4. Legal compliance info from CPCB 2016\n5. Local recycler matching for resource recovery",
+        "hi": "Circular AI bridges waste generation and resource recovery using multimodal GenAI."
+    },
+    "settings": {
+        "en": "System Settings"
+    },
+    "api_keys_config": {
+        "en": "API Configuration Check"
+    },
+    "api_warning": {
+        "en": "Please configure your API keys in .env file"
+    },
+    "features": {
+        "en": "Platform Features"
+    },
+    "feature_list": {
+        "en": "- Multimodal waste identification\n- CPCB 2016 compliance checking\n- Hazardous material detection\n- Local recycler price matching\n- Hindi/English interface\n- EPR compliance tracking"
+    },
+    "welcome_title": {
+        "en": "Circular AI Platform"
+    },
+    "welcome_info": {
+        "en": "Upload an image of waste material to begin analysis. Our AI will identify the material type, assess safety, check compliance with CPCB regulations, and connect you with local recyclers."
+    },
+    "material_metric": {
+        "en": "Material Types"
+    },
+    "safety_metric": {
+        "en": "Safety Checks"
+    },
+    "cpcb_metric": {
+        "en": "Regulatory Coverage"
+    },
+    "lang_metric": {
+        "en": "Supported Languages"
+    },
+    "safety_guidelines_title": {
+        "en": "Safety Protocols"
+    },
+    "regulatory_compliance": {
+        "en": "Regulatory Compliance"
+    }
+}
+_TRANSLATIONS = MappingProxyType(_TRANSLATIONS_RAW)
+
+
+def _language_tables(translations: dict) -> MappingProxyType:
+    """
+    Fold key -> {lang: text} into one flat key -> text table per language,
+    so a lookup is one probe into the requested language
+    """
+    tables = {}
+    for key, by_language in translations.items():
+        for language, text in by_language.items():
+            tables.setdefault(language, {})[key] = text
+    return MappingProxyType({language: MappingProxyType(table) for language, table in tables.items()})
+
+
+_TABLES = _language_tables(_TRANSLATIONS_RAW)
+_EN = _TABLES.get("en", {})
+
+
+@lru_cache(maxsize=512)
+def _lookup(text_key: str, language: str) -> str:
+    # Safe to memoize: the tables are read-only and never reloaded
+    table = _TABLES.get(language)
+    if table is not None and text_key in table:
+        return table[text_key]
+    # Fallback to English if language not available; unknown keys return the key itself
+    return _EN.get(text_key, text_key)
+
+
 class LocalizationManager:
     """
     Manages localization for the Circular AI application with Hindi/English support
     """
     
     def __init__(self):
-        self.translations = {
-            "upload_waste": {
-                "en": "Upload Waste Image",
-                "hi": "कचरा चित्र अपलोड करें"
-            },
-            "hazardous_detected": {
-                "en": "⚠️ HAZARDOUS MATERIAL DETECTED",
-                "hi": "⚠️ खतरनाक सामग्री पाई गई"
-            },
-            "safe_for_recycling": {
-                "en": "✅ SAFE FOR RECYCLING",
-                "hi": "✅ पुनः चक्रण के लिए सुरक्षित"
-            },
-            "processing": {
-                "en": "Processing image...",
-                "hi": "छवि संसोधित की जा रही है..."
-            },
-            "results": {
-                "en": "Analysis Results",
-                "hi": "विश्लेषण परिणाम"
-            },
-            "material_type": {
-                "en": "Material Type",
-                "hi": "सामग्री का प्रकार"
-            },
-            "confidence": {
-                "en": "Confidence",
-                "hi": "आत्मविश्वास"
-            },
-            "analyze_button": {
-                "en": "🔍 Analyze Waste Material",
-                "hi": "🔍 कचरा सामग्री का विश्लेषण करें"
-            },
-            "material_analysis": {
-                "en": "🔬 Material Analysis",
-                "hi": "🔬 सामग्री विश्लेषण"
-            },
-            "safety_guidelines": {
-                "en": "🛡️ Safety Guidelines",
-                "hi": "🛡️ सुरक्षा दिशानिर्देश"
-            },
-            "compliance_info": {
-                "en": "📋 Regulatory Compliance",
-                "hi": "📋 नियामक अनुपालन"
-            },
-            "recycling_options": {
-                "en": "♻️ Local Recycling Options",
-                "hi": "♻️ स्थानीय पुनर्चक्रण विकल्प"
-            },
-            "welcome_message": {
-                "en": "Upload an image of waste material to begin analysis. Our AI will identify the material type, assess safety, check compliance with CPCB regulations, and connect you with local recyclers.",
-                "hi": "विश्लेषण शुरू करने के लिए कचरा सामग्री की छवि अपलोड करें। हमारा एआई सामग्री के प्रकार की पहचान करेगा, सुरक्षा का मूल्यांकन करेगा, सीपीसीबी नियमों के अनुपालन की जाँच करेगा और आपको स्थानीय पुनर्चक्रण कर्ताओं से जोड़ेगा।"
-            },
-            "about_title": {
-                "en": "About Circular AI",
-                "hi": "सर्कुलर एआई के बारे में"
-            },
-            "about_description": {
-                "en": "Circular AI bridges waste generation and resource recovery using multimodal GenAI.",
-                "hi": "सर्कुलर एआई मल्टीमॉडल जेनएआई का उपयोग करके अपशिष्ट उत्पादन और संसाधन पुनर्प्राप्ति के बीच पुल बनाता है।"
-            },
-            "features_title": {
-                "en": "Features",
-                "hi": "विशेषताएँ"
-            },
-            "multimodal_identification": {
-                "en": "Multimodal waste identification",
-                "hi": "मल्टीमॉडल कचरा पहचान"
-            },
-            "cpcb_compliance": {
-                "en": "CPCB 2016 compliance checking",
-                "hi": "सीपीसीबी 2016 अनुपालन जांच"
-            },
-            "hazardous_detection": {
-                "en": "Hazardous material detection",
-                "hi": "खतरनाक सामग्री का पता लगाना"
-            },
-            "recycler_matching": {
-                "en": "Local recycler price matching",
-                "hi": "स्थानीय पुनर्चक्रण कर्ता मूल्य मिलान"
-            },
-            "language_support": {
-                "en": "Hindi/English interface",
-                "hi": "हिंदी/अंग्रेजी इंटरफेस"
-            },
-            "epr_tracking": {
-                "en": "EPR compliance tracking",
-                "hi": "ईपीआर अनुपालन ट्रैकिंग"
-            },
-            "image_details": {
-                "en": "Image Details:",
-                "hi": "छवि विवरण:"
-            },
-            "size_label": {
-                "en": "Size:",
-                "hi": "आकार:"
-            },
-            "format_label": {
-                "en": "Format:",
-                "hi": "प्रारूप:"
-            },
-            "mode_label": {
-                "en": "Mode:",
-                "hi": "मोड:"
-            },
-            "settings_title": {
-                "en": "Settings",
-                "hi": "सेटिंग्स"
-            },
-            "api_configured": {
-                "en": "API Keys Configured",
-                "hi": "एपीआई कुंजियाँ कॉन्फ़िगर की गईं"
-            },
-            "configure_api_warning": {
-                "en": "Please configure your API keys in .env file",
-                "hi": "कृपया अपनी एपीआई कुंजियाँ .env फ़ाइल में कॉन्फ़िगर करें"
-            },
-            "contact_recycler": {
-                "en": "Contact Recycler",
-                "hi": "पुनर्चक्रणकर्ता से संपर्क करें"
-            },
-            "contact_request_sent": {
-                "en": "Contact request sent to",
-                "hi": "से संपर्क अनुरोध भेजा गया"
-            },
-            "location_label": {
-                "en": "Location:",
-                "hi": "स्थान:"
-            },
-            "distance_label": {
-                "en": "Distance:",
-                "hi": "दूरी:"
-            },
-            "materials_accepted": {
-                "en": "Materials Accepted:",
-                "hi": "स्वीकृत सामग्री:"
-            },
-            "capacity_label": {
-                "en": "Capacity:",
-                "hi": "क्षमता:"
-            },
-            "contact_label": {
-                "en": "Contact:",
-                "hi": "संपर्क:"
-            },
-            "cpcb_guidelines": {
-                "en": "CPCB Disposal Guidelines:",
-                "hi": "सीपीसीबी निपटान दिशानिर्देश:"
-            },
-            "regulatory_citations": {
-                "en": "Regulatory Citations:",
-                "hi": "नियामक उद्धरण:"
-            },
-            "reference_sources": {
-                "en": "Reference Sources:",
-                "hi": "संदर्भ स्रोत:"
-            },
-            "risk_categories": {
-                "en": "Risk Categories:",
-                "hi": "जोखिम श्रेणियाँ:"
-            },
-            "required_safety_measures": {
-                "en": "Required Safety Measures:",
-                "hi": "आवश्यक सुरक्षा उपाय:"
-            },
-            "standard_procedures": {
-                "en": "Follow standard recycling procedures.",
-                "hi": "मानक पुनर्चक्रण प्रक्रियाओं का पालन करें।"
-            },
-            "protective_equipment": {
-                "en": "Use regular protective equipment.",
-                "hi": "नियमित सुरक्षात्मक उपकरण का उपयोग करें।"
-            },
-            "hazard_warning": {
-                "en": "This material poses potential risks.",
-                "hi": "यह सामग्री संभावित जोखिम पैदा करती है।"
-            },
-            "high_risk_warning": {
-                "en": "⚠️ HIGH RISK - HAZARDOUS MATERIAL DETECTED",
-                "hi": "⚠️ उच्च जोखिम - खतरनाक सामग्री पाई गई"
-            },
-            "medium_risk_warning": {
-                "en": "⚠️ MEDIUM RISK - CAUTION ADVISED",
-                "hi": "⚠️ माध्यम जोखिम - सावधानी की सलाह दी जाती है"
-            },
-            "category_label": {
-                "en": "Category:",
-                "hi": "श्रेणी:"
-            },
-            "description_label": {
-                "en": "Description:",
-                "hi": "विवरण:"
-            },
-            "confidence_score": {
-                "en": "Confidence Score:",
-                "hi": "आत्मविश्वास स्कोर:"
-            },
-            "language_selection": {
-                "en": "Language",
-                "hi": "भाषा"
-            },
-            "english_option": {
-                "en": "English",
-                "hi": "English"
-            },
-            "hindi_option": {
-                "en": "Hindi",
-                "hi": "हिंदी"
-            },
-            "title_en": {
-                "en": "🌍 Circular AI: Waste-to-Resource Navigator",
-                "hi": "🌍 सर्कुलर एआई: कचरा-से-संसाधन नेविगेटर"
-            },
-            "subtitle_en": {
-                "en": "Bridging Waste Generation and Resource Recovery with AI",
-                "hi": "एआई के साथ कचरा उत्पादन और संसाधन पुनर्प्राप्ति के बीच पुल बनाना"
-            }
-        }
+        # Shared read-only tables; nothing is copied per instance
+        self.translations = _TRANSLATIONS
+        self._tables = _TABLES
+        self._languages = tuple(sorted(_TABLES))
     
     def get_translation(self, text_key: str, language: str = "en") -> str:
         """
@@ -234,15 +317,7 @@ class LocalizationManager:
         Returns:
             Translated text
         """
-        if text_key in self.translations:
-            if language in self.translations[text_key]:
-                return self.translations[text_key][language]
-            else:
-                # Fallback to English if language not available
-                return self.translations[text_key]["en"]
-        else:
-            # If key doesn't exist, return the key itself
-            return text_key
+        return _lookup(text_key, language)
     
     def get_available_languages(self) -> list:
         """
@@ -251,10 +326,7 @@ class LocalizationManager:
         Returns:
             List of language codes
         """
-        languages = set()
-        for key, translations in self.translations.items():
-            languages.update(translations.keys())
-        return sorted(list(languages))
+        return list(self._languages)
     
     def translate_dict(self, data: dict, language: str = "en") -> dict:
         """
@@ -302,7 +374,7 @@ def get_text(text_key: str, language: str = "en") -> str:
     Returns:
         Translated text
     """
-    return localization_manager.get_translation(text_key, language)
+    return _lookup(text_key, language)
 
 def get_available_languages() -> list:
     """
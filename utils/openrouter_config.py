@@ -1,41 +1,87 @@
-import os
-from typing import Optional
-from openai import OpenAI
+from dotenv import load_dotenv
+from utils.env import env
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+from openai import OpenAI, AsyncOpenAI
+from utils.http import get_http_client, get_async_http_client, per_event_loop
 
+# Config is read from the env() snapshot, so everything here is built once per
+# process (the async client once per event loop). env() is cached too, so call
+# reload_config() rather than a single getter's .cache_clear() to pick up
+# rotated credentials.
 
+
+@lru_cache(maxsize=1)
 def get_openrouter_client() -> OpenAI:
-    api_key = os.getenv("OPENROUTER_API_KEY")
+    api_key = env().get("OPENROUTER_API_KEY")
+    if not api_key:
+        raise ValueError("OPENROUTER_API_KEY not found in environment variables")
+
+    base_url = env().get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+    # Retries are done by utils.retry around each call, not by the SDK as well
+    return OpenAI(base_url=base_url, api_key=api_key, http_client=get_http_client(), max_retries=0)
+
+
+@per_event_loop
+def get_openrouter_async_client() -> AsyncOpenAI:
+    api_key = env().get("OPENROUTER_API_KEY")
     if not api_key:
         raise ValueError("OPENROUTER_API_KEY not found in environment variables")
 
-    base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-    return OpenAI(base_url=base_url, api_key=api_key)
+    base_url = env().get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+    return AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=get_async_http_client(), max_retries=0)
 
 
-def get_openrouter_headers() -> dict:
+@lru_cache(maxsize=1)
+def get_openrouter_headers() -> Mapping[str, str]:
     headers = {}
-    app_url = os.getenv("OPENROUTER_APP_URL")
-    app_name = os.getenv("OPENROUTER_APP_NAME")
+    app_url = env().get("OPENROUTER_APP_URL")
+    app_name = env().get("OPENROUTER_APP_NAME")
     if app_url:
         headers["HTTP-Referer"] = app_url
     if app_name:
         headers["X-Title"] = app_name
-    return headers
+    # Shared between callers, so hand out a read-only view
+    return MappingProxyType(headers)
 
 
+@lru_cache(maxsize=1)
 def get_openrouter_model_text() -> str:
-    return os.getenv("OPENROUTER_MODEL_TEXT", "openai/gpt-4o-mini")
+    return env().get("OPENROUTER_MODEL_TEXT", "openai/gpt-4o-mini")
 
 
+@lru_cache(maxsize=1)
 def get_openrouter_model_vision() -> str:
-    return os.getenv("OPENROUTER_MODEL_VISION", "openai/gpt-4o-mini")
+    return env().get("OPENROUTER_MODEL_VISION", "openai/gpt-4o-mini")
 
 
+@lru_cache(maxsize=1)
 def get_openrouter_embedding_model() -> Optional[str]:
-    value = os.getenv("OPENROUTER_EMBEDDING_MODEL", "").strip()
+    value = env().get("OPENROUTER_EMBEDDING_MODEL", "").strip()
     return value or None
 
 
+@lru_cache(maxsize=1)
 def is_strict_genai() -> bool:
-    value = os.getenv("STRICT_GENAI", "1").strip().lower()
+    value = env().get("STRICT_GENAI", "1").strip().lower()
     return value in {"1", "true", "yes", "on"}
+
+
+def reload_config() -> None:
+    """
+    Re-read .env and the process environment and drop every cached client and setting
+    """
+    # .env values already copied into os.environ are only replaced with override=True
+    load_dotenv(override=True)
+    env.cache_clear()
+    for getter in (
+        get_openrouter_client,
+        get_openrouter_async_client,
+        get_openrouter_headers,
+        get_openrouter_model_text,
+        get_openrouter_model_vision,
+        get_openrouter_embedding_model,
+        is_strict_genai,
+    ):
+        getter.cache_clear()
@@ -1,9 +1,63 @@
-﻿import json
+﻿import heapq
+import json
 import os
 import math
-from typing import List, Dict, Optional
+import pickle
+from collections import defaultdict
+from functools import lru_cache
+from typing import FrozenSet, List, Dict, Optional
+
+import numpy as np
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "recyclers.json")
+# Parsed recyclers plus their lookup tables, reused while DATA_PATH's size and mtime match
+INDEX_CACHE_PATH = os.path.join(os.path.dirname(DATA_PATH), ".cache", "recyclers_index.pkl")
+# Bump whenever the tuple returned by _build_indexes changes shape
+INDEX_CACHE_VERSION = 1
 
 _RECYCLERS_CACHE = None
+# Lookup tables over _RECYCLERS_CACHE positions, built once when it is loaded
+_BY_CITY: Dict[str, List[int]] = {}
+_BY_MATERIAL: Dict[str, FrozenSet[int]] = {}
+_HAZARD_HANDLERS: FrozenSet[int] = frozenset()
+# Recycler coordinates in radians, NaN where the location is incomplete
+_LAT_RAD = np.empty(0)
+_LON_RAD = np.empty(0)
+_EARTH_RADIUS_KM = 6371.0
+# Per-position result fields that don't depend on the query, plus the display
+# rate used when a recycler has no rate for the requested material
+_RESULT_BASE: List[Dict] = []
+_RATES: List[Dict] = []
+_FALLBACK_RATE: List[Optional[float]] = []
+_HAZARD_KEYWORDS = ("hazardous", "medical", "battery", "e-waste", "pesticide", "chemical")
+
+# (substring, canonical material) checked in order by _normalize_material
+_MATERIAL_KEYWORDS = (
+    ("pet", "PET"),
+    ("bottle", "PET"),
+    ("hdpe", "HDPE"),
+    ("ldpe", "LDPE"),
+    ("pp", "PP"),
+    ("polypropylene", "PP"),
+    ("ps", "PS"),
+    ("polystyrene", "PS"),
+    ("paper", "Paper"),
+    ("cardboard", "Cardboard"),
+    ("corrugated", "Cardboard"),
+    ("glass", "Glass"),
+    ("metal", "Metal"),
+    ("aluminum", "Metal"),
+    ("steel", "Metal"),
+    ("electronic", "Electronics"),
+    ("e-waste", "Electronics"),
+    ("ewaste", "Electronics"),
+    ("circuit", "Electronics"),
+    ("battery", "Batteries"),
+    ("chemical", "Hazardous Chemicals"),
+    ("pesticide", "Hazardous Chemicals"),
+    ("medical", "Medical Waste"),
+    ("biohazard", "Medical Waste"),
+)
 
 
 def _load_recyclers() -> List[Dict]:
@@ -11,53 +65,149 @@ def _load_recyclers() -> List[Dict]:
     if _RECYCLERS_CACHE is not None:
         return _RECYCLERS_CACHE
 
-    data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "recyclers.json")
-    with open(data_path, "r", encoding="utf-8") as f:
-        _RECYCLERS_CACHE = json.load(f)
+    source = _source_signature()
+    cached = _read_index_cache(source)
+    if cached is not None:
+        recyclers, indexes = cached
+    else:
+        with open(DATA_PATH, "r", encoding="utf-8") as f:
+            recyclers = json.load(f)
+        indexes = _build_indexes(recyclers)
+        _write_index_cache(source, recyclers, indexes)
+
+    _install_indexes(indexes)
+    _RECYCLERS_CACHE = recyclers
     return _RECYCLERS_CACHE
 
 
-def _haversine_km(lat1, lon1, lat2, lon2) -> float:
-    # Earth radius in km
-    r = 6371.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
+def _source_signature() -> Optional[tuple]:
+    try:
+        stat = os.stat(DATA_PATH)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _read_index_cache(source: Optional[tuple]) -> Optional[tuple]:
+    """
+    (recyclers, indexes) from INDEX_CACHE_PATH, or None on any kind of mismatch
+    """
+    if source is None:
+        return None
+    try:
+        with open(INDEX_CACHE_PATH, "rb") as f:
+            version, cached_source, recyclers, indexes = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, IndexError, pickle.UnpicklingError):
+        return None
+    if version != INDEX_CACHE_VERSION or cached_source != source:
+        return None
+    if not isinstance(indexes, tuple) or len(indexes) != _INDEX_FIELDS:
+        return None
+    return recyclers, indexes
+
+
+def _write_index_cache(source: Optional[tuple], recyclers: List[Dict], indexes: tuple) -> None:
+    if source is None:
+        return
+    tmp_path = f"{INDEX_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(INDEX_CACHE_PATH), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((INDEX_CACHE_VERSION, source, recyclers, indexes), f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Readers see either the old file or the complete new one
+        os.replace(tmp_path, INDEX_CACHE_PATH)
+    except OSError:
+        pass
+
+
+# Number of tables _build_indexes returns, in _install_indexes' order
+_INDEX_FIELDS = 8
 
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return r * c
 
+def _install_indexes(indexes: tuple) -> None:
+    global _BY_CITY, _BY_MATERIAL, _HAZARD_HANDLERS, _LAT_RAD, _LON_RAD, _RESULT_BASE, _RATES, _FALLBACK_RATE
+    _BY_CITY, _BY_MATERIAL, _HAZARD_HANDLERS, _LAT_RAD, _LON_RAD, _RESULT_BASE, _RATES, _FALLBACK_RATE = indexes
 
+
+def _build_indexes(recyclers: List[Dict]) -> tuple:
+    """
+    Lookup tables over recycler positions, in the order _install_indexes expects
+    """
+    by_city = defaultdict(list)
+    by_material = defaultdict(set)
+    hazard_handlers = set()
+    lats = []
+    lons = []
+    result_base = []
+    all_rates = []
+    fallback_rates = []
+    for i, r in enumerate(recyclers):
+        loc = r.get("location", {})
+        by_city[loc.get("city", "").lower()].append(i)
+        lat = loc.get("latitude")
+        lon = loc.get("longitude")
+        complete = lat is not None and lon is not None
+        lats.append(lat if complete else np.nan)
+        lons.append(lon if complete else np.nan)
+        for m in r.get("materials", []):
+            by_material[m.lower()].add(i)
+        materials = " ".join(r.get("materials", [])).lower()
+        if any(k in materials for k in _HAZARD_KEYWORDS):
+            hazard_handlers.add(i)
+
+        rates = r.get("rates", {})
+        fallback_rate = None
+        if rates:
+            # Best available rate, shown when there is no exact match for the material
+            try:
+                fallback_rate = max(rates.values())
+            except Exception:
+                fallback_rate = list(rates.values())[0]
+        all_rates.append(rates)
+        fallback_rates.append(fallback_rate)
+        result_base.append({
+            "id": r.get("id"),
+            "name": r.get("name"),
+            "address": r.get("address"),
+            "materials": r.get("materials", []),
+            "distance": None,
+            "rate": None,
+            "contact": r.get("contact", {}).get("phone"),
+            "latitude": lat,
+            "longitude": lon
+        })
+    return (
+        dict(by_city),
+        {m: frozenset(indices) for m, indices in by_material.items()},
+        frozenset(hazard_handlers),
+        np.radians(np.array(lats, dtype=float)),
+        np.radians(np.array(lons, dtype=float)),
+        result_base,
+        all_rates,
+        fallback_rates
+    )
+
+
+def _haversine_all(lat: float, lon: float) -> List[float]:
+    """
+    Distance in km from (lat, lon) to every loaded recycler, by position
+    """
+    phi = math.radians(lat)
+    dphi = _LAT_RAD - phi
+    dlambda = _LON_RAD - math.radians(lon)
+
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi) * np.cos(_LAT_RAD) * np.sin(dlambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return (_EARTH_RADIUS_KM * c).tolist()
+
+
+@lru_cache(maxsize=256)
 def _normalize_material(material_type: str) -> str:
     m = (material_type or "").lower()
-    if "pet" in m or "bottle" in m:
-        return "PET"
-    if "hdpe" in m:
-        return "HDPE"
-    if "ldpe" in m:
-        return "LDPE"
-    if "pp" in m or "polypropylene" in m:
-        return "PP"
-    if "ps" in m or "polystyrene" in m:
-        return "PS"
-    if "paper" in m:
-        return "Paper"
-    if "cardboard" in m or "corrugated" in m:
-        return "Cardboard"
-    if "glass" in m:
-        return "Glass"
-    if "metal" in m or "aluminum" in m or "steel" in m:
-        return "Metal"
-    if "electronic" in m or "e-waste" in m or "ewaste" in m or "circuit" in m:
-        return "Electronics"
-    if "battery" in m:
-        return "Batteries"
-    if "chemical" in m or "pesticide" in m:
-        return "Hazardous Chemicals"
-    if "medical" in m or "biohazard" in m:
-        return "Medical Waste"
+    # First matching needle wins, so order matters
+    for needle, canonical in _MATERIAL_KEYWORDS:
+        if needle in m:
+            return canonical
     return material_type.strip().title() if material_type else "Mixed"
 
 
@@ -72,70 +222,41 @@ def match_recyclers(
     recyclers = _load_recyclers()
     target_material = _normalize_material(material_type)
 
-    # Filter by city if provided
-    filtered = recyclers
+    # Filter by city if provided (fallback to all cities if none match)
+    candidates = range(len(recyclers))
     if city:
-        city_lower = city.strip().lower()
-        filtered = [r for r in recyclers if r.get("location", {}).get("city", "").lower() == city_lower]
-        if not filtered:
-            # Fallback to all cities if none match
-            filtered = recyclers
+        candidates = _BY_CITY.get(city.strip().lower()) or candidates
 
-    # Filter by hazardous if needed
+    # Filter by hazardous if needed (keep the city set if no handler is in it)
     if hazardous:
-        hazard_keywords = {"hazardous", "medical", "battery", "e-waste", "pesticide", "chemical"}
-        filtered_h = []
-        for r in filtered:
-            materials = " ".join(r.get("materials", [])).lower()
-            if any(k in materials for k in hazard_keywords):
-                filtered_h.append(r)
-        if filtered_h:
-            filtered = filtered_h
+        candidates = [i for i in candidates if i in _HAZARD_HANDLERS] or candidates
 
     # Score by material match
-    scored = []
-    for r in filtered:
-        materials = r.get("materials", [])
-        material_match = any(target_material.lower() == m.lower() for m in materials)
-        score = 1 if material_match else 0
+    accepting = _BY_MATERIAL.get(target_material.lower(), frozenset())
+    distances = None
+    if user_lat is not None and user_lon is not None:
+        distances = _haversine_all(user_lat, user_lon)
 
-        distance_km = None
-        if user_lat is not None and user_lon is not None:
-            loc = r.get("location", {})
-            lat = loc.get("latitude")
-            lon = loc.get("longitude")
-            if lat is not None and lon is not None:
-                distance_km = _haversine_km(user_lat, user_lon, lat, lon)
+    def _distance(i: int) -> Optional[float]:
+        if distances is None or math.isnan(distances[i]):
+            return None
+        return distances[i]
 
-        scored.append((score, distance_km, r))
+    def _rank(i: int):
+        distance_km = _distance(i)
+        return (0 if i in accepting else 1, distance_km if distance_km is not None else 1e9)
 
-    # Sort: material match first, then distance if available
-    scored.sort(key=lambda x: (-x[0], x[1] if x[1] is not None else 1e9))
+    # Top `limit`: material match first, then distance if available
+    top = heapq.nsmallest(limit, candidates, key=_rank)
 
     results = []
-    for _, distance_km, r in scored[:limit]:
-        rate = None
-        rates = r.get("rates", {})
-        if target_material in rates:
-            rate = rates.get(target_material)
-        elif rates:
-            # Fallback to best available rate for display if exact match not found
-            try:
-                rate = max(rates.values())
-            except Exception:
-                rate = list(rates.values())[0]
-
-        loc = r.get("location", {})
+    for i in top:
+        distance_km = _distance(i)
+        rate = _RATES[i].get(target_material, _FALLBACK_RATE[i])
         results.append({
-            "id": r.get("id"),
-            "name": r.get("name"),
-            "address": r.get("address"),
-            "materials": r.get("materials", []),
+            **_RESULT_BASE[i],
             "distance": round(distance_km, 2) if distance_km is not None else None,
-            "rate": rate,
-            "contact": r.get("contact", {}).get("phone"),
-            "latitude": loc.get("latitude"),
-            "longitude": loc.get("longitude")
+            "rate": rate
         })
 
     return results
@@ -0,0 +1,92 @@
+import asyncio
+import functools
+import random
+import time
+from typing import Optional, Tuple
+
+import httpx
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def _status_code(e: Exception) -> Optional[int]:
+    # openai.APIStatusError exposes status_code, google.genai's APIError code and
+    # Pinecone's ApiException status; other clients only carry the response
+    for code in (
+        getattr(e, "status_code", None),
+        getattr(e, "code", None),
+        getattr(e, "status", None),
+        getattr(getattr(e, "response", None), "status_code", None)
+    ):
+        if isinstance(code, int) and not isinstance(code, bool):
+            return code
+    return None
+
+
+def _is_transient(e: Exception, retry_on: Tuple[int, ...]) -> bool:
+    # Only network errors and HTTP status codes count; error messages are never matched
+    if isinstance(e, httpx.TransportError) or isinstance(e.__cause__, httpx.TransportError):
+        return True
+    code = _status_code(e)
+    return code is not None and code in retry_on
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+def _delay(e: Exception, attempt: int, base: float, cap: float, jitter: bool) -> float:
+    retry_after = _retry_after(e)
+    if retry_after is not None:
+        # Honour the server's hint, but never sleep longer than the backoff cap
+        return min(cap, retry_after)
+    delay = min(cap, base * 2 ** (attempt - 1))
+    if jitter:
+        delay = delay / 2 + random.uniform(0, delay / 2)
+    return delay
+
+
+def retry_with_backoff(
+    max_attempts: int = 3,
+    base: float = 0.5,
+    cap: float = 8.0,
+    jitter: bool = True,
+    retry_on: Tuple[int, ...] = RETRY_STATUS_CODES
+):
+    """
+    Retry a sync or async call on rate limits, 5xx responses and network errors,
+    with exponential backoff. A Retry-After header on the error takes precedence.
+    The last error is re-raised once max_attempts is reached. Clients called
+    inside must have their own retries disabled (max_retries=0).
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(1, max_attempts + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        if attempt == max_attempts or not _is_transient(e, retry_on):
+                            raise
+                        await asyncio.sleep(_delay(e, attempt, base, cap, jitter))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_attempts or not _is_transient(e, retry_on):
+                        raise
+                    time.sleep(_delay(e, attempt, base, cap, jitter))
+        return wrapper
+
+    return decorator
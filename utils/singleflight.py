@@ -0,0 +1,62 @@
+import asyncio
+import copy
+import weakref
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key: the first caller runs
+    the call, later callers with the same key await its result instead of
+    issuing their own. Nothing is cached once the call completes.
+
+    Each waiter gets its own deep copy of the result, so callers may mutate it
+    freely. If the leading call is cancelled, waiters retry instead of being
+    cancelled along with it.
+    """
+
+    def __init__(self):
+        # Futures are bound to their event loop, so in-flight calls are tracked per loop
+        self._inflight = weakref.WeakKeyDictionary()
+
+    async def do(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        while True:
+            pending = inflight.get(key)
+            if pending is None:
+                break
+            try:
+                # Shielded so a cancelled waiter doesn't cancel the shared future
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled() and not _cancelling():
+                    # The leader was cancelled, not us; run the call again
+                    continue
+                raise
+            return copy.deepcopy(result)
+
+        fut = loop.create_future()
+        inflight[key] = fut
+        try:
+            result = await coro_factory()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark the exception as retrieved so an un-awaited future doesn't log it
+            fut.exception()
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            inflight.pop(key, None)
+
+
+def _cancelling() -> bool:
+    # Task.cancelling() is 3.11+; older loops can't tell, so assume only the leader was cancelled
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling and cancelling())
@@ -1,5 +1,29 @@
 ﻿import streamlit as st
-from typing import Dict, List
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from utils.localization import get_text
+
+_HEADER_COLUMNS = (3, 1)
+_LANGUAGE_LABELS = ("English", "Hindi")
+
+
+# Pure formatting, memoized across Streamlit reruns; callers pass tuples of
+# strings so the arguments hash (LLM-sourced lists go through str() first)
+@lru_cache(maxsize=256)
+def _bullet_list(items: Tuple[str, ...]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+@lru_cache(maxsize=256)
+def _format_hazard_categories(categories: Tuple[str, ...]) -> str:
+    return _bullet_list(tuple(cat.replace('_', ' ').title() for cat in categories))
+
+
+@lru_cache(maxsize=256)
+def _format_materials(materials: Tuple[str, ...]) -> str:
+    return ", ".join(materials)
 
 
 def render_safety_indicator(is_hazardous: bool, risk_level: str = "low"):
@@ -53,14 +77,12 @@ def render_safety_guidelines(safety_assessment: Dict):
         hazard_cats = safety_assessment.get("hazard_categories", [])
         if hazard_cats:
             st.write("**Risk Categories:**")
-            for cat in hazard_cats:
-                st.write(f"- {cat.replace('_', ' ').title()}")
+            st.markdown(_format_hazard_categories(tuple(hazard_cats)))
 
         guidelines = safety_assessment.get("safety_guidelines", [])
         if guidelines:
             st.write("**Required Safety Measures:**")
-            for guideline in guidelines:
-                st.write(f"- {guideline}")
+            st.markdown(_bullet_list(tuple(guidelines)))
     else:
         st.write("**Material is safe for standard recycling procedures.**")
         st.write("Follow general waste segregation guidelines and use regular protective equipment.")
@@ -80,14 +102,12 @@ def render_compliance_info(compliance_data: Dict):
     citations = compliance_data.get("citations", [])
     if citations:
         st.write("**Regulatory Citations:**")
-        for citation in citations:
-            st.write(f"- {citation}")
+        st.markdown(_bullet_list(tuple(map(str, citations))))
 
     sources = compliance_data.get("sources", [])
     if sources:
         st.write("**Reference Sources:**")
-        for source in sources:
-            st.write(f"- {source}")
+        st.markdown(_bullet_list(tuple(map(str, sources))))
 
 
 def render_recycler_options(recyclers: List[Dict]):
@@ -107,7 +127,7 @@ def render_recycler_options(recyclers: List[Dict]):
         with st.expander(f"{recycler.get('name', 'Recycler')} - INR {rate}/kg", expanded=True):
             st.write(f"**Location:** {recycler.get('address', 'Address not available')}")
             st.write(f"**Distance:** {distance_display}")
-            st.write(f"**Materials Accepted:** {', '.join(recycler.get('materials', []))}")
+            st.write(f"**Materials Accepted:** {_format_materials(tuple(recycler.get('materials', [])))}")
             if recycler.get("contact"):
                 st.write(f"**Contact:** {recycler.get('contact')}")
 
@@ -120,7 +140,7 @@ def render_multilanguage_header(current_lang: str = "en"):
     """
     Render multilanguage header options
     """
-    col1, col2 = st.columns([3, 1])
+    col1, col2 = st.columns(_HEADER_COLUMNS)
 
     with col1:
         st.title("Circular AI: Waste-to-Resource Navigator")
@@ -128,7 +148,7 @@ def render_multilanguage_header(current_lang: str = "en"):
     with col2:
         language = st.selectbox(
             "Language",
-            ["English", "Hindi"],
+            _LANGUAGE_LABELS,
             key="language_selector"
         )
 
@@ -147,116 +167,13 @@ def translate_text(text_key: str, lang: str = "en") -> str:
     """
     Translate text based on language preference
     """
-    translations = {
-        "upload_waste": {
-            "en": "Upload Waste Image",
-            "hi": "Upload Waste Image"
-        },
-        "hazardous_detected": {
-            "en": "HAZARDOUS MATERIAL DETECTED",
-            "hi": "HAZARDOUS MATERIAL DETECTED"
-        },
-        "safe_for_recycling": {
-            "en": "SAFE FOR RECYCLING",
-            "hi": "SAFE FOR RECYCLING"
-        },
-        "processing": {
-            "en": "Processing image...",
-            "hi": "Processing image..."
-        },
-        "results": {
-            "en": "Analysis Results",
-            "hi": "Analysis Results"
-        },
-        "material_type": {
-            "en": "Material Type",
-            "hi": "Material Type"
-        },
-        "confidence": {
-            "en": "Confidence",
-            "hi": "Confidence"
-        },
-        "about": {
-            "en": "About Circular AI",
-            "hi": "About Circular AI"
-        },
-        "about_desc": {
-            "en": "**Circular AI** bridges waste generation and resource recovery using multimodal GenAI.\n\n1. Upload an image of waste material\n2. AI identifies material type and properties\n3. Safety assessment determines hazard level\n4. Legal compliance info from CPCB 2016\n5. Local recycler matching for resource recovery",
-            "hi": "Circular AI bridges waste generation and resource recovery using multimodal GenAI."
-        },
-        "settings": {
-            "en": "System Settings",
-            "hi": "System Settings"
-        },
-        "api_keys_config": {
-            "en": "API Configuration Check",
-            "hi": "API Configuration Check"
-        },
-        "api_warning": {
-            "en": "Please configure your API keys in .env file",
-            "hi": "Please configure your API keys in .env file"
-        },
-        "features": {
-            "en": "Platform Features",
-            "hi": "Platform Features"
-        },
-        "feature_list": {
-            "en": "- Multimodal waste identification\n- CPCB 2016 compliance checking\n- Hazardous material detection\n- Local recycler price matching\n- Hindi/English interface\n- EPR compliance tracking",
-            "hi": "- Multimodal waste identification\n- CPCB 2016 compliance checking\n- Hazardous material detection\n- Local recycler price matching\n- Hindi/English interface\n- EPR compliance tracking"
-        },
-        "image_details": {
-            "en": "Image Metadata",
-            "hi": "Image Metadata"
-        },
-        "analyze_button": {
-            "en": "Analyze Material",
-            "hi": "Analyze Material"
-        },
-        "welcome_title": {
-            "en": "Circular AI Platform",
-            "hi": "Circular AI Platform"
-        },
-        "welcome_info": {
-            "en": "Upload an image of waste material to begin analysis. Our AI will identify the material type, assess safety, check compliance with CPCB regulations, and connect you with local recyclers.",
-            "hi": "Upload an image of waste material to begin analysis. Our AI will identify the material type, assess safety, check compliance with CPCB regulations, and connect you with local recyclers."
-        },
-        "material_metric": {
-            "en": "Material Types",
-            "hi": "Material Types"
-        },
-        "safety_metric": {
-            "en": "Safety Checks",
-            "hi": "Safety Checks"
-        },
-        "cpcb_metric": {
-            "en": "Regulatory Coverage",
-            "hi": "Regulatory Coverage"
-        },
-        "lang_metric": {
-            "en": "Supported Languages",
-            "hi": "Supported Languages"
-        },
-        "recycling_options": {
-            "en": "Local Recovery Centers",
-            "hi": "Local Recovery Centers"
-        },
-        "safety_guidelines_title": {
-            "en": "Safety Protocols",
-            "hi": "Safety Protocols"
-        },
-        "regulatory_compliance": {
-            "en": "Regulatory Compliance",
-            "hi": "Regulatory Compliance"
-        }
-    }
-
-    return translations.get(text_key, {}).get(lang, translations.get(text_key, {}).get("en", text_key))
-
-
-def show_loading_animation():
+    return get_text(text_key, lang)
+
+
+@contextmanager
+def analyzing_spinner(message: str = "Analyzing waste material..."):
     """
-    Show loading animation while processing
+    Show a loading spinner for as long as the wrapped work runs
     """
-    with st.spinner("Analyzing waste material..."):
-        import time
-        time.sleep(2)
+    with st.spinner(message):
+        yield